@@ -1,19 +1,140 @@
+import json
+import logging
+import os
+import threading
+from functools import wraps
+from typing import Callable, Optional
+
 from dotenv import load_dotenv
-from flask import Flask, jsonify, make_response, Response, request
+from flask import current_app, Flask, g, Response, request, session
+from flask.logging import default_handler
 from flask_login import LoginManager, login_user, logout_user, login_required, current_user
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from werkzeug.exceptions import HTTPException
 
 from config import ProductionConfig
 
 from coach_peter.db import db
-from coach_peter.models.goal_model import Goals
+from coach_peter.models.goal_model import Goals, guard_lazy_loads
 from coach_peter.models.plan_model import PlanModel
 from coach_peter.models.user_model import Users
+from coach_peter.utils.cache_utils import TTLCache
 from coach_peter.utils.logger import configure_logger
 
 
 load_dotenv()
 
 
+def _encode_error(message: str) -> bytes:
+    return json.dumps({"status": "error", "message": message}, separators=(",", ":")).encode()
+
+
+# Fixed error bodies, encoded once instead of on every failed request
+_ERR_AUTH_REQUIRED = _encode_error("Authentication required")
+_ERR_CREDENTIALS_REQUIRED = _encode_error("Username and password are required")
+_ERR_NEW_PASSWORD_REQUIRED = _encode_error("New password is required")
+_ERR_INVALID_CREDENTIALS = _encode_error("Invalid username or password")
+_ERR_INTERNAL = _encode_error("Internal server error")
+
+# Constant head and tail of the get-all-goals-from-plan body; only the id list is encoded per request
+_PLAN_GOALS_PREFIX = b'{"status":"success","goals":'
+_PLAN_GOALS_SUFFIX = b'}'
+
+
+# Expected JSON bodies: field -> (accepted types, description used in error messages)
+_CREDENTIALS_SCHEMA = {
+    "username": (str, "a string"),
+    "password": (str, "a string"),
+}
+_NEW_PASSWORD_SCHEMA = {
+    "new_password": (str, "a string"),
+}
+_ADD_GOAL_SCHEMA = {
+    "target": (str, "a string"),
+    "goal_value": (int, "an int"),
+    "goal_progress": ((int, float), "a float or an int"),
+    "completed": (bool, "a bool"),
+}
+
+
+# Lookups one /api/goals/query request may batch with the value type each needs, and how many it may hold
+_GOAL_QUERY_SCHEMA = {
+    "id": (int, "an int"),
+    "target": (str, "a string"),
+    "completed": (bool, "a bool"),
+    "value": (int, "an int"),
+}
+_MAX_GOAL_QUERIES = 50
+# Largest page the catalog listing returns; bigger limits are clamped to it
+_MAX_PAGE_SIZE = 100
+# Integer lookups must fit the database's 64-bit INTEGER
+_MIN_QUERY_INT = -2 ** 63
+_MAX_QUERY_INT = 2 ** 63 - 1
+
+_CREDENTIALS_FIELDS = frozenset(_CREDENTIALS_SCHEMA)
+_NEW_PASSWORD_FIELDS = frozenset(_NEW_PASSWORD_SCHEMA)
+_ADD_GOAL_FIELDS = frozenset(_ADD_GOAL_SCHEMA)
+
+# One pre-encoded type error per create-goal field
+_ERR_INVALID_GOAL_TYPE = {
+    field: _encode_error(f"Invalid input types: {field} should be {description}")
+    for field, (_, description) in _ADD_GOAL_SCHEMA.items()
+}
+
+
+def _compile_type_check(schema: dict) -> Callable[[dict], Optional[str]]:
+    """Build a type checker specialised to one schema.
+
+    The field order, accepted types and bool handling are resolved here once, so
+    each request only runs the isinstance checks. bool is a subclass of int, so
+    booleans are only accepted where the schema asks for a bool.
+
+    Args:
+        schema (dict): Field -> (accepted types, description).
+
+    Returns:
+        Callable[[dict], Optional[str]]: Returns the first field whose value does not
+            match the schema, or None if all do.
+
+    """
+    checks = tuple((field, types, types is bool) for field, (types, _) in schema.items())
+
+    def check(data: dict) -> Optional[str]:
+        for field, types, wants_bool in checks:
+            value = data[field]
+            if isinstance(value, bool) is not wants_bool or not isinstance(value, types):
+                return field
+        return None
+
+    return check
+
+
+_check_credentials = _compile_type_check(_CREDENTIALS_SCHEMA)
+_check_new_password = _compile_type_check(_NEW_PASSWORD_SCHEMA)
+_check_add_goal = _compile_type_check(_ADD_GOAL_SCHEMA)
+
+
+def _json(body: bytes, code: int) -> Response:
+    """Wrap an already-encoded JSON body in a response."""
+    return Response(body, code, mimetype="application/json")
+
+
+def _dumps(payload: dict) -> str:
+    """Encode a payload with the app's JSON provider."""
+    # The provider's compact setting only applies to its response() method, so pass the separators here
+    return current_app.json.dumps(payload, separators=(",", ":"))
+
+
+def json_response(payload: dict, status: int = 200) -> Response:
+    """Encode a payload with the app's JSON provider directly into a response.
+
+    Skips the argument dispatch that make_response(jsonify(...)) goes through.
+
+    """
+    return _json(_dumps(payload), status)
+
+
 def create_app(config_class=ProductionConfig) -> Flask:
     """Create a Flask application with the specified configuration.
 
@@ -25,32 +146,222 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     """
     app = Flask(__name__)
+    # Flask's default handler writes on the request thread; the queued handler replaces it
+    app.logger.removeHandler(default_handler)
     configure_logger(app.logger)
 
     app.config.from_object(config_class)
+    if app.debug:
+        # Fail fast on accidental per-goal lazy loads while developing
+        guard_lazy_loads()
+
+    # Encode responses without sorting keys or pretty-printing
+    app.json.sort_keys = False
+    app.json.compact = True
+    app.json.ensure_ascii = False
 
     # Initialize database
     db.init_app(app)
-    with app.app_context():
-        db.create_all()
+    if app.config.get("AUTO_CREATE_TABLES", False):
+        with app.app_context():
+            db.create_all()
 
     # Initialize login manager
     login_manager = LoginManager()
     login_manager.init_app(app)
     login_manager.login_view = 'login'
 
+    # Bumped by /api/reset-users; sessions from before the last reset in this process
+    # no longer authenticate, even for routes that never load the user
+    users_epoch = {"value": 0}
+
+    def _session_is_current() -> bool:
+        return session.get("_users_epoch") == users_epoch["value"]
+
     @login_manager.user_loader
     def load_user(user_id):
-        return Users.query.filter_by(username=user_id).first()
+        if not _session_is_current():
+            return None
+        # Memoize within the request so repeated loads don't re-query the DB
+        user_cache = g.setdefault('_user_cache', {})
+        if user_id not in user_cache:
+            try:
+                # Primary-key lookup is served from the identity map after the first load
+                user_cache[user_id] = db.session.get(Users, int(user_id))
+            except ValueError:
+                # Sessions issued before ids were used as the login key hold a username
+                user_cache[user_id] = None
+        return user_cache[user_id]
+
+    @app.teardown_request
+    def clear_user_cache(exc=None):
+        g.pop('_user_cache', None)
 
     @login_manager.unauthorized_handler
     def unauthorized():
-        return make_response(jsonify({
-            "status": "error",
-            "message": "Authentication required"
-        }), 401)
+        return _json(_ERR_AUTH_REQUIRED, 401)
+
+    def auth_required(view):
+        """Require a login without loading the user from the database.
+
+        Only gates access: it checks the signed session cookie holds a user id issued
+        since the last users reset, so it suits routes that don't need the user row or
+        per-user data. A user deleted one at a time keeps passing until logged out,
+        but user ids are never reused, so such a session can't act as anyone else.
+
+        """
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if session.get("_user_id") is None or not _session_is_current():
+                return login_manager.unauthorized()
+            return view(*args, **kwargs)
+        return wrapper
+
+    def handle_errors(action: Optional[str] = None, value_error_status: Optional[int] = 400):
+        """Turn exceptions raised by a route into JSON error responses.
+
+        Args:
+            action (str, optional): Completes "An internal error occurred ..." for unexpected
+                errors. Without it the response is a bare "Internal server error". The
+                exception text is only sent back as details when the app runs in debug mode.
+            value_error_status (int, optional): Status for a ValueError, whose message is
+                returned to the client. None treats a ValueError like any other error.
+                Defaults to 400.
+
+        """
+        def decorator(view):
+            @wraps(view)
+            def wrapper(*args, **kwargs):
+                try:
+                    return view(*args, **kwargs)
+                except Exception as e:
+                    message = str(e)
+                    if value_error_status is not None and isinstance(e, ValueError):
+                        app.logger.warning("%s failed: %s", view.__name__, message)
+                        return json_response({
+                            "status": "error",
+                            "message": message
+                        }, value_error_status)
+
+                    app.logger.error("%s failed: %s", view.__name__, message)
+                    if action is None:
+                        return _json(_ERR_INTERNAL, 500)
+                    body = {
+                        "status": "error",
+                        "message": f"An internal error occurred {action}"
+                    }
+                    if app.debug:
+                        body["details"] = message
+                    return json_response(body, 500)
+            return wrapper
+        return decorator
+
+    @app.errorhandler(Exception)
+    def handle_unexpected_error(e):
+        """Answer errors that escape a route with the JSON 500 body.
+
+        HTTP errors such as 404 and 405 keep their own status and response.
+
+        """
+        if isinstance(e, HTTPException):
+            return e
+        app.logger.error("Unhandled error on %s: %s", request.path, e)
+        return _json(_ERR_INTERNAL, 500)
 
-    plan_model = PlanModel()
+    def _clear_table(table, restart_ids: bool = True) -> None:
+        """Delete every row from a table in one statement, keeping the schema in place.
+
+        Args:
+            table: The table to clear.
+            restart_ids (bool, optional): Start ids again from 1 where the table allows it.
+                Pass False for tables whose ids must never be handed out twice. Defaults to True.
+
+        """
+        if db.engine.dialect.name == "postgresql":
+            restart = "RESTART IDENTITY" if restart_ids else "CONTINUE IDENTITY"
+            db.session.execute(text(f'TRUNCATE TABLE "{table.name}" {restart} CASCADE'))
+        else:
+            # SQLite reuses INTEGER PRIMARY KEY values unless the table is AUTOINCREMENT
+            db.session.execute(table.delete())
+        db.session.commit()
+
+    def _parse_json(required_fields: frozenset = frozenset()) -> tuple[dict, set]:
+        """Parse the request body once and return the required fields it lacks.
+
+        A body that is missing, not sent as JSON, not valid JSON or not an object is
+        treated as empty. Null values are left for the schema check to reject.
+
+        """
+        data = None
+        if request.is_json:
+            try:
+                # Each body is read once, so skip Flask's cached copy of the raw and parsed data
+                data = json.loads(request.get_data(cache=False))
+            except ValueError:
+                pass
+        if not isinstance(data, dict):
+            data = {}
+        return data, required_fields.difference(data)
+
+    # Each user gets their own plan; plans are held in this process only
+    plans: dict[int, PlanModel] = {}
+    plans_lock = threading.Lock()
+    # Encoded get-all-goals-from-plan bodies per user, with the plan version they were built from
+    plan_bodies: dict[int, tuple[int, bytes]] = {}
+
+    def _current_plan() -> PlanModel:
+        """Return the logged-in user's plan, creating an empty one on first use."""
+        with plans_lock:
+            plan = plans.get(current_user.id)
+            if plan is None:
+                plan = plans[current_user.id] = PlanModel()
+            return plan
+
+    # Short-lived cache for catalog reads; cleared by every route that writes goals
+    goal_cache = TTLCache(ttl=int(os.getenv("TTL", 60)))
+
+    # Catalog version behind the read routes' ETags; the per-process tag stops two
+    # workers at the same version from vouching for each other's data
+    catalog_version = {"value": 0}
+    catalog_lock = threading.Lock()
+    process_tag = os.urandom(4).hex()
+
+    def _catalog_changed() -> None:
+        """Drop cached catalog reads and invalidate outstanding ETags after a write."""
+        with catalog_lock:
+            catalog_version["value"] += 1
+        # Only frees memory: entries are keyed by version, so a reader that started
+        # before the write and caches its rows afterwards can't serve them again
+        goal_cache.clear()
+
+    def _catalog_etag(version: int) -> str:
+        return f"catalog-{process_tag}-{version}"
+
+    # The read helpers take the catalog version the request read once, up front, so
+    # what they cache fits the ETag sent with it
+    def _all_goals(version: int, sort_by_target: bool) -> list[dict]:
+        key = ("all_goals", version, sort_by_target)
+        goals = goal_cache.get(key)
+        if goals is None:
+            goals = Goals.get_all_goals(sort_by_target=sort_by_target)
+            goal_cache.set(key, goals)
+        return goals
+
+    def _goals_page(version: int, after_id: int, limit: int) -> tuple[list[dict], Optional[int]]:
+        key = ("goals_page", version, after_id, limit)
+        page = goal_cache.get(key)
+        if page is None:
+            page = Goals.get_goals_page(after_id=after_id, limit=limit)
+            goal_cache.set(key, page)
+        return page
+
+    def _goal_target_by_id(version: int, goal_id: int) -> str:
+        key = ("goal_target", version, goal_id)
+        target = goal_cache.get(key)
+        if target is None:
+            target = Goals.get_goal_by_id(goal_id).target
+            goal_cache.set(key, target)
+        return target
 
     @app.route('/api/health', methods=['GET'])
     def healthcheck() -> Response:
@@ -61,10 +372,10 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         """
         app.logger.info("Health check endpoint hit")
-        return make_response(jsonify({
+        return json_response({
             'status': 'success',
             'message': 'Service is running'
-        }), 200)
+        })
 
     ##########################################################
     #
@@ -73,6 +384,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
     #########################################################
 
     @app.route('/api/create-user', methods=['PUT'])
+    @handle_errors("while creating user")
     def create_user() -> Response:
         """Register a new user account.
 
@@ -87,37 +399,26 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if the username or password is missing.
             500 error if there is an issue creating the user in the database.
         """
-        try:
-            data = request.get_json()
-            username = data.get("username")
-            password = data.get("password")
-
-            if not username or not password:
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Username and password are required"
-                }), 400)
-
-            Users.create_user(username, password)
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"User '{username}' created successfully"
-            }), 201)
+        data, missing = _parse_json(_CREDENTIALS_FIELDS)
+
+        if (
+            missing
+            or _check_credentials(data)
+            or not data["username"]
+            or not data["password"]
+        ):
+            return _json(_ERR_CREDENTIALS_REQUIRED, 400)
+
+        username = data["username"]
+        Users.create_user(username, data["password"])
+        return json_response({
+            "status": "success",
+            "message": f"User '{username}' created successfully"
+        }, 201)
 
-        except ValueError as e:
-            return make_response(jsonify({
-                "status": "error",
-                "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"User creation failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while creating user",
-                "details": str(e)
-            }), 500)
 
     @app.route('/api/login', methods=['POST']) #
+    @handle_errors("during login", value_error_status=401)
     def login() -> Response:
         """Authenticate a user and log them in.
 
@@ -131,42 +432,28 @@ def create_app(config_class=ProductionConfig) -> Flask:
         Raises:
             401 error if the username or password is incorrect.
         """
-        try:
-            data = request.get_json()
-            username = data.get("username")
-            password = data.get("password")
-
-            if not username or not password:
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Username and password are required"
-                }), 400)
-
-            if Users.check_password(username, password):
-                user = Users.query.filter_by(username=username).first()
-                login_user(user)
-                return make_response(jsonify({
-                    "status": "success",
-                    "message": f"User '{username}' logged in successfully"
-                }), 200)
-            else:
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Invalid username or password"
-                }), 401)
-
-        except ValueError as e:
-            return make_response(jsonify({
-                "status": "error",
-                "message": str(e)
-            }), 401)
-        except Exception as e:
-            app.logger.error(f"Login failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred during login",
-                "details": str(e)
-            }), 500)
+        data, missing = _parse_json(_CREDENTIALS_FIELDS)
+
+        if (
+            missing
+            or _check_credentials(data)
+            or not data["username"]
+            or not data["password"]
+        ):
+            return _json(_ERR_CREDENTIALS_REQUIRED, 400)
+
+        username = data["username"]
+        user = Users.authenticate(username, data["password"])
+        if user:
+            login_user(user)
+            session["_users_epoch"] = users_epoch["value"]
+            return json_response({
+                "status": "success",
+                "message": f"User '{username}' logged in successfully"
+            })
+        else:
+            return _json(_ERR_INVALID_CREDENTIALS, 401)
+
 
     @app.route('/api/logout', methods=['POST'])
     @login_required
@@ -178,13 +465,14 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
         """
         logout_user()
-        return make_response(jsonify({
+        return json_response({
             "status": "success",
             "message": "User logged out successfully"
-        }), 200)
+        })
 
     @app.route('/api/change-password', methods=['POST'])
     @login_required
+    @handle_errors("while changing password")
     def change_password() -> Response:
         """Change the password for the current user.
 
@@ -198,64 +486,43 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if the new password is not provided.
             500 error if there is an issue updating the password in the database.
         """
-        try:
-            data = request.get_json()
-            new_password = data.get("new_password")
-
-            if not new_password:
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "New password is required"
-                }), 400)
-
-            username = current_user.username
-            Users.update_password(username, new_password)
-            return make_response(jsonify({
-                "status": "success",
-                "message": "Password changed successfully"
-            }), 200)
+        data, missing = _parse_json(_NEW_PASSWORD_FIELDS)
+
+        if missing or _check_new_password(data) or not data["new_password"]:
+            return _json(_ERR_NEW_PASSWORD_REQUIRED, 400)
+
+        username = current_user.username
+        Users.update_password(username, data["new_password"])
+        return json_response({
+            "status": "success",
+            "message": "Password changed successfully"
+        })
 
-        except ValueError as e:
-            return make_response(jsonify({
-                "status": "error",
-                "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"Password change failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while changing password",
-                "details": str(e)
-            }), 500)
 
     @app.route('/api/reset-users', methods=['DELETE'])
+    @handle_errors("while deleting users", value_error_status=None)
     def reset_users() -> Response:
-        """Recreate the users table to delete all users.
+        """Delete all users from the users table.
 
         Returns:
-            JSON response indicating the success of recreating the Users table.
+            JSON response indicating the success of clearing the Users table.
 
         Raises:
-            500 error if there is an issue recreating the Users table.
+            500 error if there is an issue clearing the Users table.
         """
-        try:
-            app.logger.info("Received request to recreate Users table")
-            with app.app_context():
-                Users.__table__.drop(db.engine)
-                Users.__table__.create(db.engine)
-            app.logger.info("Users table recreated successfully")
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"Users table recreated successfully"
-            }), 200)
+        app.logger.debug("Received request to clear Users table")
+        # Session cookies carry the user id, so ids must not come back after a reset
+        _clear_table(Users.__table__, restart_ids=False)
+        with plans_lock:
+            users_epoch["value"] += 1
+            plans.clear()
+            plan_bodies.clear()
+        app.logger.info("Users table cleared successfully")
+        return json_response({
+            "status": "success",
+            "message": f"Users table recreated successfully"
+        })
 
-        except Exception as e:
-            app.logger.error(f"Users table recreation failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while deleting users",
-                "details": str(e)
-            }), 500)
 
     ##########################################################
     #
@@ -264,37 +531,29 @@ def create_app(config_class=ProductionConfig) -> Flask:
     ##########################################################
 
     @app.route('/api/reset-goals', methods=['DELETE'])
+    @handle_errors("while deleting goals", value_error_status=None)
     def reset_goals() -> Response:
-        """Recreate the goals table to delete goals.
+        """Delete all goals from the goals table.
 
         Returns:
-            JSON response indicating the success of recreating the goals table.
+            JSON response indicating the success of clearing the goals table.
 
         Raises:
-            500 error if there is an issue recreating the goals table.
+            500 error if there is an issue clearing the goals table.
         """
-        try:
-            app.logger.info("Received request to recreate goals table")
-            with app.app_context():
-                Goals.__table__.drop(db.engine)
-                Goals.__table__.create(db.engine)
-            app.logger.info("Goals table recreated successfully")
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"Goals table recreated successfully"
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Goals table recreation failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while deleting users",
-                "details": str(e)
-            }), 500)
+        app.logger.debug("Received request to clear goals table")
+        _clear_table(Goals.__table__)
+        _catalog_changed()
+        app.logger.info("Goals table cleared successfully")
+        return json_response({
+            "status": "success",
+            "message": f"Goals table recreated successfully"
+        })
 
 
     @app.route('/api/create-goal', methods=['POST'])
     @login_required
+    @handle_errors("while adding the goal", value_error_status=None)
     def add_goal() -> Response:
         """Route to create a new goal.
 
@@ -305,89 +564,51 @@ def create_app(config_class=ProductionConfig) -> Flask:
             - completed (bool): Boolean for if the goal is completed.
 
         Returns:
-            JSON response indicating the success of the goal addition.
+            JSON response indicating the success of the goal addition, with the new goal's ID.
 
         Raises:
             400 error if input validation fails.
             500 error if there is an issue adding the goal to the plan.
 
         """
-        app.logger.info("Received request to add a new goal")
+        app.logger.debug("Received request to add a new goal")
 
-        try:
-            data = request.get_json()
-
-            required_fields = ["target", "goal_value", "goal_progress", "completed"]
-            missing_fields = [field for field in required_fields if field not in data]
-
-            if missing_fields:
-                app.logger.warning(f"Missing required fields: {missing_fields}")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": f"Missing required fields: {', '.join(missing_fields)}"
-                }), 400)
-
-            target = data["target"]
-            goal_value = data["goal_value"]
-            goal_progress = data["goal_progress"]
-            completed = data["completed"]
-
-            if (
-                not isinstance(target, str)
-            ):
-                app.logger.warning("Invalid input data types - target")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Invalid input types: target should be a string"
-                }), 400)
-            
-            if (
-                not isinstance(goal_value, int)
-            ):
-                app.logger.warning("Invalid input data types - goal_value")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Invalid input types: goal_value should be an int"
-                }), 400)
-            
-            if (
-                not isinstance(goal_progress, (float))
-            ):
-                app.logger.warning("Invalid input data types - goal_progress")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Invalid input types: goal_progress should be a float or an int"
-                }), 400)
-            
-            if (
-                not isinstance(completed, bool)
-            ):
-                app.logger.warning("Invalid input data types - completed")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": "Invalid input types: completed should be a bool"
-                }), 400)
-
-            app.logger.info(f"Adding goal: {target}, {goal_value}, {goal_progress}, completed = {completed}")
-            Goals.create_goal(target=target, goal_value=goal_value, goal_progress=goal_progress, completed=completed)
-
-            app.logger.info(f"goal added successfully: {target}, {goal_value}, {goal_progress}, completed = {completed}")
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"goal with target: '{target}', goal_value: '{goal_value}' added successfully"
-            }), 201)
+        data, missing_fields = _parse_json(_ADD_GOAL_FIELDS)
 
-        except Exception as e:
-            app.logger.error(f"Failed to add goal: {e}")
-            return make_response(jsonify({
+        if missing_fields:
+            # Report in schema order so the message is stable
+            missing_fields = [field for field in _ADD_GOAL_SCHEMA if field in missing_fields]
+            app.logger.warning("Missing required fields: %s", missing_fields)
+            return json_response({
                 "status": "error",
-                "message": "An internal error occurred while adding the goal",
-                "details": str(e)
-            }), 500)
+                "message": f"Missing required fields: {', '.join(missing_fields)}"
+            }, 400)
+
+        invalid_field = _check_add_goal(data)
+        if invalid_field:
+            app.logger.warning("Invalid input data types - %s", invalid_field)
+            return _json(_ERR_INVALID_GOAL_TYPE[invalid_field], 400)
+
+        target = data["target"]
+        goal_value = data["goal_value"]
+        goal_progress = data["goal_progress"]
+        completed = data["completed"]
+
+        app.logger.info("Adding goal: %s, %s, %s, completed = %s", target, goal_value, goal_progress, completed)
+        goal_id = Goals.create_goal(target=target, goal_value=goal_value, goal_progress=goal_progress, completed=completed)
+        _catalog_changed()
+
+        app.logger.info("goal added successfully: %s, %s, %s, completed = %s", target, goal_value, goal_progress, completed)
+        return json_response({
+            "status": "success",
+            "message": f"goal with target: '{target}', goal_value: '{goal_value}' added successfully",
+            "goal_id": goal_id
+        }, 201)
 
 
     @app.route('/api/delete-goal/<int:goal_id>', methods=['DELETE'])
     @login_required
+    @handle_errors("while deleting the goal", value_error_status=None)
     def delete_goal(goal_id: int) -> Response:
         """Route to delete a goal by ID.
 
@@ -402,72 +623,81 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue removing the goal from the database.
 
         """
-        try:
-            app.logger.info(f"Received request to delete goal with ID {goal_id}")
-
-            # Check if the goal exists before attempting to delete
-            goal = Goals.get_goal_by_id(goal_id)
-            if not goal:
-                app.logger.warning(f"Goal with ID {goal_id} not found.")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": f"goal with ID {goal_id} not found"
-                }), 400)
+        app.logger.debug("Received request to delete goal with ID %s", goal_id)
 
+        # The DELETE's row count tells whether the goal existed, so there is no lookup first
+        try:
             Goals.delete_goal(goal_id)
-            app.logger.info(f"Successfully deleted goal with ID {goal_id}")
-
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"goal with ID {goal_id} deleted successfully"
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Failed to delete goal: {e}")
-            return make_response(jsonify({
+        except ValueError:
+            app.logger.warning("Goal with ID %s not found.", goal_id)
+            return json_response({
                 "status": "error",
-                "message": "An internal error occurred while deleting the goal",
-                "details": str(e)
-            }), 500)
+                "message": f"goal with ID {goal_id} not found"
+            }, 400)
+        _catalog_changed()
+        app.logger.info("Successfully deleted goal with ID %s", goal_id)
+
+        return json_response({
+            "status": "success",
+            "message": f"goal with ID {goal_id} deleted successfully"
+        })
 
 
     @app.route('/api/get-all-goals-from-catalog', methods=['GET'])
-    @login_required
+    @auth_required
+    @handle_errors("while retrieving goals", value_error_status=None)
     def get_all_goals() -> Response:
         """Route to retrieve all goals in the catalog (non-deleted), with an option to sort by target.
 
+        Query Parameter:
+            - sort_by_target (str, optional): 'true' to sort the goals by target.
+            - limit (int, optional): Return one page of at most this many goals, ordered by ID.
+              Limits above 100 are treated as 100.
+            - after (int, optional): With limit, the next_after value from the previous page.
+
         Returns:
-            JSON response containing the list of goals.
+            JSON response containing the list of goals, and next_after when paging.
 
         Raises:
+            400 error if limit is not a positive integer or after is not a non-negative integer.
             500 error if there is an issue retrieving goals from the catalog.
 
         """
-        try:
-            # Extract query parameter for sorting by play count
-            app.logger.info(f"Received request to retrieve all goals from catalog")
-
-            goals = Goals.get_all_goals()
-
-            app.logger.info(f"Successfully retrieved {len(goals)} goals from the catalog")
-
-            return make_response(jsonify({
-                "status": "success",
-                "message": "goals retrieved successfully",
-                "goals": goals
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Failed to retrieve goals: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while retrieving goals",
-                "details": str(e)
-            }), 500)
+        # Extract query parameter for sorting by target
+        sort_by_target = request.args.get('sort_by_target', 'false').lower() == 'true'
+
+        app.logger.debug("Received request to retrieve all goals from catalog (sort_by_target=%s)", sort_by_target)
+
+        version = catalog_version["value"]
+        etag = _catalog_etag(version)
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304)
+
+        if 'limit' in request.args:
+            limit = request.args.get('limit', type=int)
+            if limit is None or limit < 1:
+                return json_response({"status": "error", "message": "limit must be a positive integer."}, 400)
+            after = request.args.get('after', type=int) if 'after' in request.args else 0
+            if after is None or not 0 <= after <= _MAX_QUERY_INT:
+                return json_response({"status": "error", "message": "after must be a non-negative integer."}, 400)
+            # Clamp so one request can't pull the whole table and every cached page has a bounded size
+            goals, next_after = _goals_page(version, after, min(limit, _MAX_PAGE_SIZE))
+            payload = {"status": "success", "message": "goals retrieved successfully", "goals": goals, "next_after": next_after}
+        else:
+            goals = _all_goals(version, sort_by_target)
+            payload = {"status": "success", "message": "goals retrieved successfully", "goals": goals}
+
+        if app.logger.isEnabledFor(logging.INFO):
+            app.logger.info("Successfully retrieved %s goals from the catalog", len(goals))
+
+        response = json_response(payload)
+        response.set_etag(etag, weak=True)
+        return response
 
 
     @app.route('/api/get-goal-from-catalog-by-id/<int:goal_id>', methods=['GET'])
-    @login_required
+    @auth_required
+    @handle_errors("while retrieving the goal", value_error_status=None)
     def get_goal_by_id(goal_id: int) -> Response:
         """Route to retrieve a goal by its ID.
 
@@ -482,35 +712,29 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue retrieving the goal.
 
         """
-        try:
-            app.logger.info(f"Received request to retrieve goal with ID {goal_id}")
+        app.logger.debug("Received request to retrieve goal with ID %s", goal_id)
 
-            goal = Goals.get_goal_by_id(goal_id)
-            if not goal:
-                app.logger.warning(f"Goal with ID {goal_id} not found.")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": f"Goal with ID {goal_id} not found"
-                }), 400)
+        version = catalog_version["value"]
+        etag = _catalog_etag(version)
+        if request.if_none_match.contains_weak(etag):
+            return Response(status=304)
 
-            app.logger.info(f"Successfully retrieved goal with target {goal.target}")
+        target = _goal_target_by_id(version, goal_id)
 
-            return make_response(jsonify({
-                "status": "success",
-                "message": "Goal retrieved successfully",
-                "target": goal.target
-            }), 200)
+        app.logger.info("Successfully retrieved goal with target %s", target)
+
+        response = json_response({
+            "status": "success",
+            "message": "Goal retrieved successfully",
+            "target": target
+        })
+        response.set_etag(etag, weak=True)
+        return response
 
-        except Exception as e:
-            app.logger.error(f"Failed to retrieve goal by ID: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while retrieving the goal",
-                "details": str(e)
-            }), 500)
 
     @app.route('/api/goals/by-target/<string:target>', methods=['GET'])
-    @login_required
+    @auth_required
+    @handle_errors()
     def get_goals_by_target(target: str) -> Response:
         """Route to retrieve all goals by target.
 
@@ -524,28 +748,17 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if no matching goals are found.
             500 error if there is an issue retrieving the goals.
         """
-        try:
-            app.logger.info(f"Request to retrieve goals by target: {target}")
-            goals = Goals.get_goals_by_target(target)
-            return make_response(jsonify({
-                "status": "success",
-                "goals": [g.id for g in goals] 
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Goal retrieval failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                  "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error retrieving goals by target: {e}")
-            return make_response(jsonify({
-                "status": "error", 
-                "message": "Internal server error"
-            }), 500)
+        app.logger.debug("Request to retrieve goals by target: %s", target)
+        goals = Goals.get_goals_by_target(target)
+        return json_response({
+            "status": "success",
+            "goals": [g.id for g in goals] 
+        })
+
 
     @app.route('/api/goals/by-completed/<string:completed>', methods=['GET'])
-    @login_required
+    @auth_required
+    @handle_errors()
     def get_goals_by_completed(completed: str) -> Response:
         """Route to retrieve all goals by completion status.
 
@@ -559,23 +772,18 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error for invalid boolean input or missing data.
             500 error for unexpected database issues.
         """
-        try:
-            app.logger.info(f"Request to retrieve goals by completion status: {completed}")
-            status = completed.lower() == 'true'
-            goals = Goals.get_goals_by_completed(status)
-            return make_response(jsonify({
-                "status": "success",
-                "goals": [g.id for g in goals]
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Goal retrieval failed: {e}")
-            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error retrieving completed goals: {e}")
-            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+        app.logger.debug("Request to retrieve goals by completion status: %s", completed)
+        status = completed.lower() == 'true'
+        goals = Goals.get_goals_by_completed(status)
+        return json_response({
+            "status": "success",
+            "goals": [g.id for g in goals]
+        })
+
 
     @app.route('/api/goals/by-value/<int:goal_value>', methods=['GET'])
-    @login_required
+    @auth_required
+    @handle_errors()
     def get_goals_by_goal_value(goal_value: int) -> Response:
         """Route to retrieve all goals by goal value.
 
@@ -589,22 +797,91 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if no goals are found.
             500 error if database issues occur.
         """
-        try:
-            app.logger.info(f"Request to retrieve goals by goal value: {goal_value}")
-            goals = Goals.get_goals_by_goal_value(goal_value)
-            return make_response(jsonify({
-                "status": "success",
-                "goals": [g.id for g in goals]
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Goal retrieval failed: {e}")
-            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
-        except Exception as e:
-            app.logger.error(f"Error retrieving goals by goal value: {e}")
-            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+        app.logger.debug("Request to retrieve goals by goal value: %s", goal_value)
+        goals = Goals.get_goals_by_goal_value(goal_value)
+        return json_response({
+            "status": "success",
+            "goals": [g.id for g in goals]
+        })
+
+
+    def _run_goal_query(version: int, by: str, value) -> dict:
+        """Run one lookup of a /api/goals/query batch, shaped like the matching single-lookup route."""
+        expected_type, description = _GOAL_QUERY_SCHEMA[by]
+        # Exact type check: bools are ints, and a list or dict must never reach the query
+        if type(value) is not expected_type:
+            raise ValueError(f"Query by {by} needs {description} value, got {value!r}")
+        if expected_type is int and not _MIN_QUERY_INT <= value <= _MAX_QUERY_INT:
+            raise ValueError(f"Query by {by} value {value} is out of range")
+        if by == "id":
+            return {"target": _goal_target_by_id(version, value)}
+        if by == "target":
+            goals = Goals.get_goals_by_target(value)
+        elif by == "completed":
+            goals = Goals.get_goals_by_completed(value)
+        else:
+            goals = Goals.get_goals_by_goal_value(value)
+        return {"goals": [g.id for g in goals]}
+
+    @app.route('/api/goals/query', methods=['POST'])
+    @auth_required
+    @handle_errors("while querying goals", value_error_status=None)
+    def query_goals() -> Response:
+        """Route to run several goal lookups in one request.
+
+        Expected JSON Input:
+            - queries (list): Up to 50 lookups, each {"by": ..., "value": ...} where by is
+              'id' or 'value' (with an int), 'target' (with a string) or 'completed'
+              (with a bool).
+
+        Returns:
+            JSON response with one result per query, in order. A lookup that finds
+            nothing, has a value of the wrong type or fails in the database gets an
+            error result; the others are unaffected.
+
+        Raises:
+            400 error if queries is missing, empty, too long or has a malformed entry.
+            500 error if there is an issue running the lookups.
+
+        """
+        data, _ = _parse_json()
+        queries = data.get("queries")
+        if (
+            not isinstance(queries, list) or not 0 < len(queries) <= _MAX_GOAL_QUERIES
+            or not all(
+                isinstance(q, dict) and isinstance(q.get("by"), str) and q["by"] in _GOAL_QUERY_SCHEMA and "value" in q
+                for q in queries
+            )
+        ):
+            app.logger.warning("Invalid goal query batch")
+            return json_response({
+                "status": "error",
+                "message": f"queries must be a list of 1 to {_MAX_GOAL_QUERIES} objects with 'by' (id, target, completed or value) and 'value'"
+            }, 400)
+
+        app.logger.debug("Request to run %s goal queries", len(queries))
+        version = catalog_version["value"]
+        results = []
+        for query in queries:
+            try:
+                results.append({"status": "success", **_run_goal_query(version, query["by"], query["value"])})
+            except ValueError as e:
+                results.append({"status": "error", "message": str(e)})
+            except SQLAlchemyError as e:
+                # Keep the rest of the batch: end the failed transaction and report this entry only
+                app.logger.error("Goal query %s failed: %s", query, e)
+                db.session.rollback()
+                results.append({"status": "error", "message": f"Database error while querying goals by {query['by']}"})
+
+        return json_response({
+            "status": "success",
+            "results": results
+        })
+
 
     @app.route('/api/update-goal/<int:goal_id>', methods=['PATCH']) 
     @login_required
+    @handle_errors()
     def update_goal(goal_id: int) -> Response:
         """Route to update a goal by ID.
 
@@ -624,51 +901,42 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error for invalid input or if goal not found.
             500 error for database issues.
         """
-        try:
-            data = request.get_json()
-            goal = Goals.get_goal_by_id(goal_id)
-
-            new_target = data.get("target")
-            new_goal_value = data.get("goal_value")
-            new_goal_progress = data.get("goal_progress")
-            new_completed = data.get("completed")
-
-            old_fields = [goal.target, goal.goal_value, goal.goal_progress, goal.completed]
-            new_fields = [new_target, new_goal_value, new_goal_progress, new_completed]
-            updated_fields = []
-
-            for i in range(len(old_fields)):
-                if old_fields[i] != new_fields[i]:
-                    updated_fields.append(new_fields[i])
-
-            updated_goal = Goals.update_goal(
-                goal_id,
-                target=new_target,
-                goal_value=new_goal_value,
-                goal_progress=new_goal_progress,
-                completed=new_completed
-            )
-            app.logger.info(f"Updated goal ID {goal_id} successfully.")
-            return make_response(jsonify({
-                "status": "success", 
-                "goal": updated_goal.id,
-                "updated_fields": updated_fields
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Update failed for goal {goal_id}: {e}")
-            return make_response(jsonify({
-                "status": "error", 
-                "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error updating goal {goal_id}: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "Internal server error"
-            }), 500)
+        data, _ = _parse_json()
+        goal = Goals.get_goal_by_id(goal_id)
+
+        new_target = data.get("target")
+        new_goal_value = data.get("goal_value")
+        new_goal_progress = data.get("goal_progress")
+        new_completed = data.get("completed")
+
+        old_fields = [goal.target, goal.goal_value, goal.goal_progress, goal.completed]
+        new_fields = [new_target, new_goal_value, new_goal_progress, new_completed]
+        updated_fields = []
+
+        for i in range(len(old_fields)):
+            if old_fields[i] != new_fields[i]:
+                updated_fields.append(new_fields[i])
+
+        Goals.update_goal(
+            goal_id,
+            target=new_target,
+            goal_value=new_goal_value,
+            goal_progress=new_goal_progress,
+            completed=new_completed,
+            return_goal=False
+        )
+        _catalog_changed()
+        app.logger.info("Updated goal ID %s successfully.", goal_id)
+        return json_response({
+            "status": "success", 
+            "goal": goal_id,
+            "updated_fields": updated_fields
+        })
+
 
     @app.route('/api/delete-goal-by-target/<string:target>', methods=['DELETE'])
     @login_required
+    @handle_errors()
     def delete_goal_by_target(target: str) -> Response:
         """Route to delete a goal by target.
 
@@ -682,20 +950,15 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if goal is not found.
             500 error on DB issues.
         """
-        try:
-            Goals.delete_goal_by_target(target)
-            app.logger.info(f"Deleted goal with target {target}.")
-            return make_response(jsonify({"status": "success", "message": f"Goal with target '{target}' deleted."}), 200)
-        except ValueError as e:
-            app.logger.warning(f"Goal delete failed for target {target}: {e}")
-            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error deleting goal by target {target}: {e}")
-            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+        Goals.delete_goal_by_target(target)
+        _catalog_changed()
+        app.logger.info("Deleted goal with target %s.", target)
+        return json_response({"status": "success", "message": f"Goal with target '{target}' deleted."})
 
 
     @app.route('/api/delete-goal-by-value/<int:goal_value>', methods=['DELETE'])
     @login_required
+    @handle_errors()
     def delete_goal_by_value(goal_value: int) -> Response:
         """Route to delete a goal by goal value.
 
@@ -709,20 +972,15 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if goal is not found.
             500 error on DB issues.
         """
-        try:
-            Goals.delete_goal_by_goal_value(goal_value)
-            app.logger.info(f"Deleted goal with value {goal_value}.")
-            return make_response(jsonify({"status": "success", "message": f"Goal with value {goal_value} deleted."}), 200)
-        except ValueError as e:
-            app.logger.warning(f"Goal delete failed for value {goal_value}: {e}")
-            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error deleting goal by value {goal_value}: {e}")
-            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+        Goals.delete_goal_by_goal_value(goal_value)
+        _catalog_changed()
+        app.logger.info("Deleted goal with value %s.", goal_value)
+        return json_response({"status": "success", "message": f"Goal with value {goal_value} deleted."})
 
 
     @app.route('/api/delete-goal-by-completed/<completed>', methods=['DELETE'])
     @login_required
+    @handle_errors()
     def delete_goal_by_completed(completed: str) -> Response:
         """Route to delete a goal by completed status.
 
@@ -736,21 +994,16 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 error if goal is not found.
             500 error on DB issues.
         """
-        try:
-            status = completed.lower() == 'true'
-            Goals.delete_goal_by_completed(status)
-            app.logger.info(f"Deleted goal with completed status {status}.")
-            return make_response(jsonify({"status": "success", "message": f"Goal with completed={status} deleted."}), 200)
-        except ValueError as e:
-            app.logger.warning(f"Delete by completed failed: {e}")
-            return make_response(jsonify({"status": "error", "message": str(e)}), 400)
-        except Exception as e:
-            app.logger.error(f"Error deleting goal by completed: {e}")
-            return make_response(jsonify({"status": "error", "message": "Internal server error"}), 500)
+        status = completed.lower() == 'true'
+        Goals.delete_goal_by_completed(status)
+        _catalog_changed()
+        app.logger.info("Deleted goal with completed status %s.", status)
+        return json_response({"status": "success", "message": f"Goal with completed={status} deleted."})
 
 
     @app.route('/api/goals/recommendations/<int:goal_id>', methods=['GET'])
     @login_required
+    @handle_errors()
     def get_exercise_recommendations(goal_id: int) -> Response:
         """Route to get exercise recommendations for a goal.
 
@@ -764,29 +1017,17 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 if goal not found.
             500 on external API or DB failure.
         """
-        try:
-            recommendations = Goals.get_exercise_recommendations(goal_id)
-            app.logger.info(f"Retrieved exercise recommendations for goal {goal_id}. {recommendations}")
-            return make_response(jsonify({
-                "status": "success",
-                "recommendations": recommendations
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Recommendation fetch failed: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error getting recommendations: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "Internal server error"
-            }), 500)
+        recommendations = Goals.get_exercise_recommendations(goal_id)
+        app.logger.info("Retrieved exercise recommendations for goal %s. %s", goal_id, recommendations)
+        return json_response({
+            "status": "success",
+            "recommendations": recommendations
+        })
 
 
     @app.route('/api/goals/log-session/<int:goal_id>', methods=['POST'])
     @login_required
+    @handle_errors()
     def log_workout(goal_id: int) -> Response:
         """Route to log a workout session for a goal.
 
@@ -807,33 +1048,21 @@ def create_app(config_class=ProductionConfig) -> Flask:
             400 if validation fails.
             500 on DB error.
         """
-        try:
-            data = request.get_json()
-            goal = Goals.get_goal_by_id(goal_id)
-            message = goal.log_workout_session(
-                amount=data.get("amount"),
-                exercise_type=data.get("exercise_type"),
-                duration=data.get("duration"),
-                intensity=data.get("intensity"),
-                note=data.get("note", "")
-            )
-            app.logger.info(f"Workout logged for goal {goal_id}: {message}")
-            return make_response(jsonify({
-                "status": "success",
-                "message": message
-            }), 200)
-        except ValueError as e:
-            app.logger.warning(f"Workout log failed for goal {goal_id}: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": str(e)
-            }), 400)
-        except Exception as e:
-            app.logger.error(f"Internal error logging workout for goal {goal_id}: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "Internal server error"
-            }), 500)
+        data, _ = _parse_json()
+        goal = Goals.get_goal_by_id(goal_id)
+        message = goal.log_workout_session(
+            amount=data.get("amount"),
+            exercise_type=data.get("exercise_type"),
+            duration=data.get("duration"),
+            intensity=data.get("intensity"),
+            note=data.get("note", "")
+        )
+        _catalog_changed()
+        app.logger.info("Workout logged for goal %s: %s", goal_id, message)
+        return json_response({
+            "status": "success",
+            "message": message
+        })
 
 
     ############################################################
@@ -845,6 +1074,7 @@ def create_app(config_class=ProductionConfig) -> Flask:
 
     @app.route('/api/add-goal-to-plan/<int:goal_id>', methods=['POST'])
     @login_required
+    @handle_errors("while adding the goal to the plan", value_error_status=None)
     def add_goal_to_plan(goal_id: int) -> Response:
         """Route to add a goal to the plan by goal_id.
 
@@ -859,38 +1089,22 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue adding the goal to the plan.
 
         """
-        try:
-            app.logger.info("Received request to add goal to plan")
-
-            app.logger.info(f"Looking up goal with id {goal_id}")
-            goal = Goals.get_goal_by_id(goal_id=goal_id)
+        app.logger.debug("Received request to add goal to plan")
 
-            if not goal:
-                app.logger.warning(f"Goal not found")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": f"goal not found in catalog"
-                }), 400)
+        goal = _current_plan().add_goal_to_plan(goal_id)
+        if app.logger.isEnabledFor(logging.INFO):
+            # Skip the attribute loads when INFO is off
+            app.logger.info("Successfully added goal to plan: %s - %s out of %s", goal.target, goal.goal_progress, goal.goal_value)
 
-            plan_model.add_goal_to_plan(goal_id)
-            app.logger.info(f"Successfully added goal to plan: {goal.target} - {goal.goal_progress} out of {goal.goal_value}")
-
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"goal {goal.target} - {goal.goal_progress} out of {goal.goal_value} added to plan"
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Failed to add goal to plan: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while adding the goal to the plan",
-                "details": str(e)
-            }), 500)
+        return json_response({
+            "status": "success",
+            "message": f"goal {goal.target} - {goal.goal_progress} out of {goal.goal_value} added to plan"
+        })
 
 
     @app.route('/api/remove-goal-from-plan/<int:goal_id>', methods=['DELETE'])
     @login_required
+    @handle_errors("while removing the goal from the plan", value_error_status=None)
     def remove_goal_by_goal_id(goal_id:int) -> Response:
         """Route to remove a goal from the plan by goal_id.
 
@@ -905,38 +1119,20 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue removing the goal.
 
         """
-        try:
-            app.logger.info("Received request to remove goal from plan")
-
-            app.logger.info(f"Looking up goal to remove: id - {goal_id}")
-            goal = Goals.get_goal_by_id(goal_id)
-
-            if not goal:
-                app.logger.warning(f"goal with id {goal_id} not found in catalog")
-                return make_response(jsonify({
-                    "status": "error",
-                    "message": f"goal with id {goal_id} not found in catalog"
-                }), 400)
+        app.logger.debug("Received request to remove goal from plan")
 
-            plan_model.remove_goal_by_goal_id(goal.id)
-            app.logger.info(f"Successfully removed goal with id {goal_id} from plan")
+        _current_plan().remove_goal_by_goal_id(goal_id)
+        app.logger.info("Successfully removed goal with id %s from plan", goal_id)
 
-            return make_response(jsonify({
-                "status": "success",
-                "message": f"Goal with id {goal_id} removed from plan"
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Failed to remove goal from plan: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while removing the goal from the plan",
-                "details": str(e)
-            }), 500)
+        return json_response({
+            "status": "success",
+            "message": f"Goal with id {goal_id} removed from plan"
+        })
 
 
     @app.route('/api/clear-plan', methods=['POST'])
     @login_required
+    @handle_errors("while clearing the plan", value_error_status=None)
     def clear_plan() -> Response:
         """Route to clear all goals from the plan.
 
@@ -947,24 +1143,15 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue clearing the plan.
 
         """
-        try:
-            app.logger.info("Received request to clear the plan")
+        app.logger.debug("Received request to clear the plan")
 
-            plan_model.clear_plan()
+        _current_plan().clear_plan()
 
-            app.logger.info("Successfully cleared the plan")
-            return make_response(jsonify({
-                "status": "success",
-                "message": "plan cleared"
-            }), 200)
-
-        except Exception as e:
-            app.logger.error(f"Failed to clear plan: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while clearing the plan",
-                "details": str(e)
-            }), 500)
+        app.logger.info("Successfully cleared the plan")
+        return json_response({
+            "status": "success",
+            "message": "plan cleared"
+        })
 
 
     ############################################################
@@ -986,29 +1173,27 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue retrieving the plan.
 
         """
-        try:
-            app.logger.info("Received request to retrieve all goals from the plan.")
+        app.logger.debug("Received request to retrieve all goals from the plan.")
 
-            goals = plan_model.get_all_goals()
-            goal_ids = [goal.id for goal in goals]
+        plan = _current_plan()
+        cached = plan_bodies.get(current_user.id)
+        if cached is not None and cached[0] == plan.version:
+            app.logger.debug("Serving plan from cache (version %s)", plan.version)
+            return _json(cached[1], 200)
+
+        version = plan.version
+        goal_ids = plan.get_goal_ids()
+
+        if app.logger.isEnabledFor(logging.INFO):
+            app.logger.info("Successfully retrieved %s goals from the plan.", len(goal_ids))
+        body = _PLAN_GOALS_PREFIX + json.dumps(goal_ids, separators=(",", ":")).encode() + _PLAN_GOALS_SUFFIX
+        plan_bodies[current_user.id] = (version, body)
+        return _json(body, 200)
 
-            app.logger.info(f"Successfully retrieved {len(goals)} goals from the plan.")
-            return make_response(jsonify({
-                "status": "success",
-                "goals": goal_ids
-            }), 200)
 
-        except Exception as e:
-            app.logger.error(f"Failed to retrieve goals from plan: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while retrieving the plan",
-                "details": str(e)
-            }), 500)
-        
-    
     @app.route('/api/get-plan-progress', methods=['GET'])
     @login_required
+    @handle_errors("while retrieving the plan", value_error_status=None)
     def get_plan_progress() -> Response:
         """Retrieve progress of goals in the plan.
 
@@ -1019,24 +1204,16 @@ def create_app(config_class=ProductionConfig) -> Flask:
             500 error if there is an issue retrieving progress.
 
         """
-        try:
-            app.logger.info("Received request to get progress of the plan.")
+        app.logger.debug("Received request to get progress of the plan.")
 
-            percentage = plan_model.get_plan_progress()
+        percentage = _current_plan().get_plan_progress()
 
-            app.logger.info(f"Successfully retrieved percentage of goals completed in the plan.")
-            return make_response(jsonify({
-                "status": "success",
-                "percentage": percentage
-            }), 200)
+        app.logger.info("Successfully retrieved percentage of goals completed in the plan.")
+        return json_response({
+            "status": "success",
+            "percentage": percentage
+        })
 
-        except Exception as e:
-            app.logger.error(f"Failed to retrieve goals from plan: {e}")
-            return make_response(jsonify({
-                "status": "error",
-                "message": "An internal error occurred while retrieving the plan",
-                "details": str(e)
-            }), 500)
 
     return app
 
@@ -1044,8 +1221,9 @@ if __name__ == '__main__':
     app = create_app()
     app.logger.info("Starting Flask app...")
     try:
-        app.run(debug=True, host='0.0.0.0', port=5000)
+        # Development server only; production runs under gunicorn (see wsgi.py)
+        app.run(debug=os.getenv("FLASK_DEBUG", "false").lower() == "true", host='0.0.0.0', port=5000)
     except Exception as e:
-        app.logger.error(f"Flask app encountered an error: {e}")
+        app.logger.error("Flask app encountered an error: %s", e)
     finally:
         app.logger.info("Flask app has stopped.")
\ No newline at end of file
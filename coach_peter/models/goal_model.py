@@ -1,10 +1,12 @@
 import logging
 import json 
-from sqlalchemy import Text
+from sqlalchemy import Text, bindparam, case, func, insert, literal, select
 
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Mapped, mapped_column, raiseload
 from coach_peter.utils.api_utils import fetch_recommendation
-from typing import Optional, Union
+from typing import Iterable, Iterator, Optional, Union
 
 
 from coach_peter.db import db
@@ -14,6 +16,100 @@ from coach_peter.utils.logger import configure_logger
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+def _clean(value):
+    """Strips surrounding whitespace from a string, passing clean strings and non-strings through untouched."""
+    if isinstance(value, str) and (value[:1].isspace() or value[-1:].isspace()):
+        return value.strip()
+    return value
+
+
+# Longest target the target column holds
+_MAX_TARGET_LENGTH = 255
+
+# (attribute, check, error message) applied in order by _validate_row.
+# Exact type checks skip the MRO walk and keep True/False from passing as numbers.
+_VALIDATION_RULES = (
+    # isspace() spots a blank target without allocating a stripped copy
+    ("target", lambda v: type(v) is str and bool(v) and not v.isspace(), "Target must be a non-empty string"),
+    ("target", lambda v: len(v) <= _MAX_TARGET_LENGTH, f"Target must be at most {_MAX_TARGET_LENGTH} characters."),
+    ("goal_value", lambda v: type(v) is int and bool(v), "Goal value must be a valid integer."),
+    ("goal_progress", lambda v: v is None or type(v) in (float, int), "Goal progress must be a valid float or int."),
+    ("completed", lambda v: type(v) is bool, "Completed must be either true or false."),
+)
+
+
+def _validate_field(attr: str, value) -> None:
+    """Applies the validation rules for a single attribute, for writes that only set some fields.
+
+    Raises:
+        ValueError: If the value is invalid.
+    """
+    for rule_attr, is_valid, message in _VALIDATION_RULES:
+        if rule_attr == attr and not is_valid(value):
+            raise ValueError(message)
+
+
+def _validate_row(row: dict) -> None:
+    """Validates the fields of one goal, given as a column-to-value dictionary.
+
+    Raises:
+        ValueError: If any required fields are invalid.
+    """
+    for attr, is_valid, message in _VALIDATION_RULES:
+        if not is_valid(row[attr]):
+            raise ValueError(message)
+
+    # The goal is completed exactly when progress has reached the goal value; no progress counts as 0
+    if ((row["goal_progress"] or 0) >= row["goal_value"]) != row["completed"]:
+        raise ValueError("Goal completion mismatch.")
+
+    # Every new goal starts with the empty list, which needs no parsing
+    if row["progress_notes"] == "[]":
+        return
+    try:
+        notes = json.loads(row["progress_notes"])
+        if not isinstance(notes, list):
+            raise ValueError("Progress notes must be a JSON-formatted list.")
+    except (ValueError, TypeError):
+        raise ValueError("Progress notes must be a valid JSON-formatted string representing a list.")
+
+
+def _goal_row(fields: dict) -> dict:
+    """Builds and validates the row for a new goal from its submitted fields.
+
+    Plain rows go straight to the INSERT, so no ORM instance is built per goal.
+
+    Raises:
+        ValueError: If any required fields are invalid.
+    """
+    row = {
+        "target": _clean(fields.get("target")) or None,
+        "goal_value": fields.get("goal_value"),
+        "goal_progress": fields.get("goal_progress"),
+        "completed": fields.get("completed"),
+        "progress_notes": "[]",
+    }
+    try:
+        _validate_row(row)
+    except ValueError as e:
+        logger.warning("Validation failed: %s", e)
+        raise
+    return row
+
+
+# Columns written when a goal is created, in table order after the generated ID
+_GOAL_COLUMNS = ("target", "goal_value", "goal_progress", "completed", "progress_notes")
+
+# Rows per INSERT in create_goals; large imports are split into batches of this size
+_BULK_INSERT_BATCH = 10_000
+
+# Columns that get_goals_by_field may filter on, with the wording used in log and error messages
+_FILTER_FIELDS = {
+    "target": "target",
+    "goal_value": "goal value",
+    "completed": "completion status",
+}
+
 class Goals(db.Model):
     """Represents a goal in the plan.
 
@@ -24,14 +120,21 @@ class Goals(db.Model):
     """
 
     __tablename__ = "Goals"
+    # (target, goal_value) is the compound key; its index also serves target lookups
+    __table_args__ = (
+        db.UniqueConstraint("target", "goal_value", name="uq_goals_target_goal_value"),
+        # Backs up the validation rules for rows written around the model, e.g. bulk UPDATEs
+        db.CheckConstraint("length(trim(target)) > 0", name="ck_goals_target_nonempty"),
+    )
     
     # Users can choose which types of goals they want 
-    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
-    target = db.Column(db.String, nullable=False)
-    goal_value = db.Column(db.Integer, nullable=False)
-    goal_progress = db.Column(db.Float, nullable=True, default=0)
-    completed = db.Column(db.Boolean, nullable=False)
-    progress_notes = db.Column(Text, nullable=False, default="[]")
+    id: Mapped[int] = mapped_column(db.Integer, primary_key=True, autoincrement=True)
+    target: Mapped[str] = mapped_column(db.String(_MAX_TARGET_LENGTH), nullable=False)
+    goal_value: Mapped[int] = mapped_column(db.Integer, nullable=False, index=True)
+    goal_progress: Mapped[Optional[float]] = mapped_column(db.Float, nullable=True, default=0)
+    completed: Mapped[bool] = mapped_column(db.Boolean, nullable=False)
+    progress_notes: Mapped[str] = mapped_column(Text, nullable=False, default="[]")
+    # Declare relationships with lazy="raise" and load them with selectinload() where they are read
 
     def validate(self) -> None:
         """Validates the goal instance before committing to the database.
@@ -39,84 +142,108 @@ class Goals(db.Model):
         Raises:
             ValueError: If any required fields are invalid.
         """
-        
-        # If a field is provided, check that it's a non-empty string
-        # Checks only if field is provided (because it is nullable) and if provided, must be a non-empty string
-        # if self.recurring is not None and (not isinstance(self.recurring, str) or not self.recurring.strip()):
-        #     raise ValueError("Recurring goal must be a non-empty string if provided.")
-        
-        if not self.target or not isinstance(self.target, str):
-            raise ValueError("Target must be a non-empty string")
-        if not self.goal_value or not isinstance(self.goal_value, int):
-            raise ValueError("Goal value must be a valid integer.")
-        if self.goal_progress is not None and not isinstance(self.goal_progress, (float, int)):
-            raise ValueError("Goal progress must be a valid float or int.")
-        if self.completed is None or not isinstance(self.completed, bool):
-            raise ValueError("Completed must be either true or false.")
-
-
-        #progress
-        if self.goal_progress >= self.goal_value and not self.completed or self.goal_progress < self.goal_value and self.completed:
-            raise ValueError("Goal completion mismatch.")
-        try:
-            notes = json.loads(self.progress_notes)
-            if not isinstance(notes, list):
-                raise ValueError("Progress notes must be a JSON-formatted list.")
-        except (ValueError, TypeError):
-            raise ValueError("Progress notes must be a valid JSON-formatted string representing a list.")
+        _validate_row({column: getattr(self, column) for column in _GOAL_COLUMNS})
 
     @classmethod
-    def create_goal(cls, target: str, goal_value: int, completed: bool, goal_progress: Union[float, int, None] = None) -> None:
+    def create_goal(cls, target: str, goal_value: int, completed: bool, goal_progress: Union[float, int, None] = None) -> int:
         """
         Creates a new goal in the goals table using SQLAlchemy.
 
+        The insert, the duplicate check and fetching the new ID are one
+        INSERT ... ON CONFLICT DO NOTHING RETURNING statement.
+
         Args:
             target (str): A target muscle group the user wants to work on.
             goal_value (int): A value the user wants to reach for a specific goal.
             goal_progress (float, int): A value the user enters for their current progress.
             completed (bool): If the user has completed the specific goal or not.
 
+        Returns:
+            int: The ID of the new goal.
 
         Raises:
             ValueError: If any field is invalid or if a goal with the same compound key already exists. 
             SQLAlchemyError: For any other database-related issues.
         """
-        logger.info(f"Received request to create goal.")
+        logger.info("Received request to create goal.")
+        row = _goal_row({
+            "target": target,
+            "goal_value": goal_value,
+            "goal_progress": goal_progress,
+            "completed": completed,
+        })
 
         try:
-            goal = Goals(
-                target=target.strip() if target else None,
-                goal_value=goal_value,
-                goal_progress=goal_progress,
-                completed=completed,
-                progress_notes="[]"
-            )
-            goal.validate()
-        except ValueError as e:
-            logger.warning(f"Validation failed: {e}")
+            # No row comes back when the compound key already exists
+            goal_id = db.session.execute(_insert_ignoring_duplicates().returning(cls.id), row).scalar()
+            if goal_id is None:
+                logger.error("Goal already exists: %s - %s", target, goal_value)
+                raise ValueError(f"Goal with target '{target}', goal_value '{goal_value}'.")
+
+            db.session.commit()
+            logger.info("Goal successfully added with ID %s", goal_id)
+            return goal_id
+
+        # Safety net for backends without ON CONFLICT DO NOTHING
+        except IntegrityError:
+            logger.error("Goal already exists: %s - %s", target, goal_value)
+            db.session.rollback()
+            raise ValueError(f"Goal with target '{target}', goal_value '{goal_value}'.")
+
+        except SQLAlchemyError as e:
+            logger.error("Database error while creating goal: %s", e)
+            db.session.rollback()
             raise
 
+    @classmethod
+    def create_goals(cls, goals: Iterable[dict]) -> int:
+        """
+        Creates several goals in a single transaction, skipping ones that already exist.
+
+        Every goal is validated first. The rows are then written with Core INSERTs
+        of up to _BULK_INSERT_BATCH rows each and committed once. The unique
+        (target, goal_value) constraint lets the database drop duplicates itself,
+        so no lookup runs before the insert.
+
+        Args:
+            goals (Iterable[dict]): Goal fields, each with 'target', 'goal_value',
+                'completed' and optionally 'goal_progress'.
+
+        Returns:
+            int: The number of goals created.
+
+        Raises:
+            ValueError: If any goal is invalid.
+            SQLAlchemyError: For any other database-related issues.
+        """
+        rows = [_goal_row(fields) for fields in goals]
+
+        if not rows:
+            return 0
+
         try:
-            # Check for existing goal with same compound key (target, goal_value)
-            existing = Goals.query.filter_by(target=target.strip(), goal_value=goal_value).first()
-            if existing:
-                logger.error(f"Goal already exists: {target} - {goal_value}")
-                raise ValueError(f"Goal with target '{target}', goal_value '{goal_value}'.")
-            
-            db.session.add(goal)
+            created = 0
+            insert_stmt = _insert_ignoring_duplicates()
+            for start in range(0, len(rows), _BULK_INSERT_BATCH):
+                result = db.session.execute(insert_stmt, rows[start:start + _BULK_INSERT_BATCH])
+                created += result.rowcount
+
             db.session.commit()
-            logger.info(f"Goal successfully added with target(s): {target}, goal value: {goal_value}, goal progress: {goal_progress}, and completion status: {completed}.")
+            if created < len(rows):
+                logger.info("Skipped %s goal(s) that already exist.", len(rows) - created)
+            logger.info("Successfully added %s goal(s).", created)
+            return created
 
-        # Duplicate
+        # Safety net for backends without ON CONFLICT DO NOTHING
         except IntegrityError:
-            logger.error(f"Goal already exists: {target}, goal value: {goal_value}, goal progress: {goal_progress}, and completion status: {completed}.")
+            logger.error("Duplicate goal while creating %s goal(s).", len(rows))
             db.session.rollback()
-            raise ValueError(f"Goal already exists: {target}, goal value: {goal_value}, goal progress: {goal_progress}, and completion status: {completed}.")
+            raise ValueError("One or more goals already exist.")
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while creating goal: {e}")
+            logger.error("Database error while creating goals: %s", e)
             db.session.rollback()
-            raise 
+            raise
 
 ##############################################
 # Delete Goals
@@ -134,20 +261,21 @@ class Goals(db.Model):
             ValueError: If the goal with the given ID does not exist.
             SQLAlchemyError: For any database-related issues.
         """
-        logger.info(f"Received request to delete goal with ID {goal_id}")
+        logger.info("Received request to delete goal with ID %s", goal_id)
 
         try:
-            goal = cls.query.get(goal_id)
-            if not goal:
-                logger.warning(f"Attempted to delete non-existent goal with ID {goal_id}")
+            # Delete by primary key directly; the row count says whether the goal existed.
+            # "evaluate" drops any loaded copy from the session in Python, without a SELECT
+            deleted = cls.query.filter_by(id=goal_id).delete(synchronize_session="evaluate")
+            if not deleted:
+                logger.warning("Attempted to delete non-existent goal with ID %s", goal_id)
                 raise ValueError(f"Goal with ID {goal_id} not found")
 
-            db.session.delete(goal)
             db.session.commit()
-            logger.info(f"Successfully deleted goal with ID {goal_id}")
+            logger.info("Successfully deleted goal with ID %s", goal_id)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting goal with ID {goal_id}: {e}")
+            logger.error("Database error while deleting goal with ID %s: %s", goal_id, e)
             db.session.rollback()
             raise
 
@@ -163,20 +291,20 @@ class Goals(db.Model):
             ValueError: If the goal with the given target does not exist.
             SQLAlchemyError: For any database-related issues.
         """
-        logger.info(f"Received request to delete goal with ID {target}")
+        logger.info("Received request to delete goal with target %s", target)
 
         try:
-            goal = cls.query.filter_by(target=target).first() 
+            goal = cls.query.filter_by(target=_clean(target)).first()
             if not goal:
-                logger.warning(f"Attempted to delete non-existent goal with target {target}")
+                logger.warning("Attempted to delete non-existent goal with target %s", target)
                 raise ValueError(f"Goal with target {target} not found")
 
             db.session.delete(goal)
             db.session.commit()
-            logger.info(f"Successfully deleted goal with target {target}")
+            logger.info("Successfully deleted goal with target %s", target)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting goal with target {target}: {e}")
+            logger.error("Database error while deleting goal with target %s: %s", target, e)
             db.session.rollback()
             raise
 
@@ -192,20 +320,20 @@ class Goals(db.Model):
             ValueError: If the goal with the given goal value does not exist.
             SQLAlchemyError: For any database-related issues.
         """
-        logger.info(f"Received request to delete goal with goal value {goal_value}")
+        logger.info("Received request to delete goal with goal value %s", goal_value)
 
         try:
             goal = cls.query.filter_by(goal_value=goal_value).first()
             if not goal:
-                logger.warning(f"Attempted to delete non-existent goal with goal value {goal_value}")
+                logger.warning("Attempted to delete non-existent goal with goal value %s", goal_value)
                 raise ValueError(f"Goal with goal value {goal_value} not found")
 
             db.session.delete(goal)
             db.session.commit()
-            logger.info(f"Successfully deleted goal with goal value {goal_value}")
+            logger.info("Successfully deleted goal with goal value %s", goal_value)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting goal with goal value {goal_value}: {e}")
+            logger.error("Database error while deleting goal with goal value %s: %s", goal_value, e)
             db.session.rollback()
             raise
     
@@ -221,20 +349,20 @@ class Goals(db.Model):
             ValueError: If the goal with the given completion status does not exist.
             SQLAlchemyError: For any database-related issues.
         """
-        logger.info(f"Received request to delete goal with completion status {completed}")
+        logger.info("Received request to delete goal with completion status %s", completed)
 
         try:
             goal = cls.query.filter_by(completed=completed).first()
             if not goal:
-                logger.warning(f"Attempted to delete non-existent goal with completion {completed}")
+                logger.warning("Attempted to delete non-existent goal with completion %s", completed)
                 raise ValueError(f"Goal with completion {completed} not found")
 
             db.session.delete(goal)
             db.session.commit()
-            logger.info(f"Successfully deleted goal with completion {completed}")
+            logger.info("Successfully deleted goal with completion %s", completed)
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while deleting goal with completion {completed}: {e}")
+            logger.error("Database error while deleting goal with completion %s: %s", completed, e)
             db.session.rollback()
             raise
     
@@ -268,11 +396,11 @@ class Goals(db.Model):
 
         self.goal_progress += amount
 
-        workout_note = f"{exercise_type} - {duration} min - {intensity}"
+        # The session summary is only used for logging, so leave formatting to the logger
         if note:
-            workout_note += f" | Note: {note}"
-
-        logger.info(workout_note)
+            logger.info("%s - %s min - %s | Note: %s", exercise_type, duration, intensity, note)
+        else:
+            logger.info("%s - %s min - %s", exercise_type, duration, intensity)
 
         percent = ((float)(self.goal_progress) / self.goal_value) * 100
 
@@ -321,84 +449,150 @@ class Goals(db.Model):
             ValueError: If no goal with the given ID is found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve goal with ID {goal_id}")
+        logger.info("Attempting to retrieve goal with ID %s", goal_id)
 
         try:
-            goal = cls.query.get(goal_id)
+            goal = db.session.get(cls, goal_id)
 
             if not goal:
-                logger.info(f"Goal with ID {goal_id} not found")
+                logger.info("Goal with ID %s not found", goal_id)
                 raise ValueError(f"Goal with ID {goal_id} not found")
 
-            logger.info(f"Successfully retrieved goal: ID={goal.id}, target={goal.target}, value={goal.goal_value}, progress={goal.goal_progress}, completed={goal.completed}")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Successfully retrieved goal: ID=%s, target=%s, value=%s, progress=%s, completed=%s", goal.id, goal.target, goal.goal_value, goal.goal_progress, goal.completed)
             return goal
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving goal by ID {goal_id}: {e}")
+            logger.error("Database error while retrieving goal by ID %s: %s", goal_id, e)
             raise
 
     @classmethod
-    def get_goals_by_target(cls, target: str) -> list["Goals"]:
+    def get_goals_by_ids(cls, goal_ids: Iterable[int]) -> list["Goals"]:
         """
-        Retrieves all goals matching a specific target field.
+        Retrieves the goals with the given IDs in a single query.
 
         Args:
-            target (str): The target to search for.
+            goal_ids (Iterable[int]): The IDs of the goals to retrieve.
 
         Returns:
-            list[Goals]: A list of goal instances matching the target.
+            list[Goals]: The goals found, in no particular order. IDs with no goal are left out.
 
         Raises:
-            ValueError: If no goals with the given target are found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all goals with target '{target}'")
+        goal_ids = list(goal_ids)
+        if not goal_ids:
+            return []
+
+        logger.info("Attempting to retrieve %s goals by ID", len(goal_ids))
 
         try:
-            goals = cls.query.filter_by(target=target).all()
+            return db.session.execute(_GOALS_BY_IDS_STATEMENT, {"ids": goal_ids}).scalars().all()
 
-            if not goals:
-                logger.info(f"No goals found with target '{target}'")
-                raise ValueError(f"No goals found with target '{target}'")
+        except SQLAlchemyError as e:
+            logger.error("Database error while retrieving goals by ID: %s", e)
+            raise
 
-            logger.info(f"Successfully retrieved {len(goals)} goal(s) with target '{target}'")
-            return goals
+    @classmethod
+    def count_completed(cls, goal_ids: Iterable[int]) -> tuple[int, int]:
+        """
+        Counts the completed goals among the given IDs in a single query.
+
+        Args:
+            goal_ids (Iterable[int]): The IDs of the goals to count.
+
+        Returns:
+            tuple[int, int]: The number of completed goals and the number of goals found.
+
+        Raises:
+            SQLAlchemyError: If a database error occurs.
+        """
+        goal_ids = list(goal_ids)
+        if not goal_ids:
+            return 0, 0
+
+        logger.info("Counting completed goals among %s goals", len(goal_ids))
+
+        try:
+            completed, total = db.session.execute(_COUNT_COMPLETED_STATEMENT, {"ids": goal_ids}).one()
+            return completed, total
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving goals by target '{target}': {e}")
+            logger.error("Database error while counting completed goals: %s", e)
             raise
 
     @classmethod
-    def get_goals_by_goal_value(cls, goal_value: int) -> list["Goals"]:
+    def get_goals_by_field(cls, field: str, value: Union[str, int, bool]) -> list["Goals"]:
         """
-        Retrieves all goals matching a specific goal value.
+        Retrieves all goals whose given column equals a value.
 
         Args:
-            goal_value (int): The goal value to search for.
+            field (str): The column to filter on: 'target', 'goal_value' or 'completed'.
+            value (str, int, bool): The value to match.
 
         Returns:
-            list[Goals]: A list of goal instances matching the goal value.
+            list[Goals]: A list of goal instances matching the value.
 
         Raises:
-            ValueError: If no goals with the given goal value are found.
+            ValueError: If the field cannot be filtered on or no goals match.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all goals with goal value '{goal_value}'")
+        label = _FILTER_FIELDS.get(field)
+        if label is None:
+            raise ValueError(f"Cannot filter goals by '{field}'")
+        # Targets are stored stripped, so normalize the value the same way to match on the index
+        value = _clean(value)
+
+        logger.info("Attempting to retrieve all goals with %s '%s'", label, value)
 
         try:
-            goals = cls.query.filter_by(goal_value=goal_value).all()
+            goals = db.session.execute(_FILTER_STATEMENTS[field], {"value": value}).scalars().all()
 
             if not goals:
-                logger.info(f"No goals found with goal value '{goal_value}'")
-                raise ValueError(f"No goals found with goal value '{goal_value}'")
+                logger.info("No goals found with %s '%s'", label, value)
+                raise ValueError(f"No goals found with {label} '{value}'")
 
-            logger.info(f"Successfully retrieved {len(goals)} goal(s) with goal value '{goal_value}'")
+            logger.info("Successfully retrieved %s goal(s) with %s '%s'", len(goals), label, value)
             return goals
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving goals by goal value '{goal_value}': {e}")
+            logger.error("Database error while retrieving goals by %s '%s': %s", label, value, e)
             raise
 
+    @classmethod
+    def get_goals_by_target(cls, target: str) -> list["Goals"]:
+        """
+        Retrieves all goals matching a specific target field.
+
+        Args:
+            target (str): The target to search for.
+
+        Returns:
+            list[Goals]: A list of goal instances matching the target.
+
+        Raises:
+            ValueError: If no goals with the given target are found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        return cls.get_goals_by_field("target", target)
+
+    @classmethod
+    def get_goals_by_goal_value(cls, goal_value: int) -> list["Goals"]:
+        """
+        Retrieves all goals matching a specific goal value.
+
+        Args:
+            goal_value (int): The goal value to search for.
+
+        Returns:
+            list[Goals]: A list of goal instances matching the goal value.
+
+        Raises:
+            ValueError: If no goals with the given goal value are found.
+            SQLAlchemyError: If a database error occurs.
+        """
+        return cls.get_goals_by_field("goal_value", goal_value)
+
     @classmethod
     def get_goals_by_completed(cls, completed: bool) -> list["Goals"]:
         """
@@ -414,21 +608,7 @@ class Goals(db.Model):
             ValueError: If no goals with the given completion status are found.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to retrieve all goals with completion status '{completed}'")
-
-        try:
-            goals = cls.query.filter_by(completed=completed).all()
-
-            if not goals:
-                logger.info(f"No goals found with completion status '{completed}'")
-                raise ValueError(f"No goals found with completion status '{completed}'")
-
-            logger.info(f"Successfully retrieved {len(goals)} goal(s) with completion status '{completed}'")
-            return goals
-
-        except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving goals by completion status '{completed}': {e}")
-            raise
+        return cls.get_goals_by_field("completed", completed)
 
 # Recommendations
     @classmethod
@@ -446,26 +626,54 @@ class Goals(db.Model):
             ValueError: If the goal is not found.
             RuntimeError: If the external API call fails.
         """
-        logger.info(f"Fetching exercise recommendations for goal ID {goal_id}")
+        logger.info("Fetching exercise recommendations for goal ID %s", goal_id)
 
-        goal = cls.query.get(goal_id)
+        goal = db.session.get(cls, goal_id)
         if not goal:
-            logger.warning(f"Goal with ID {goal_id} not found.")
+            logger.warning("Goal with ID %s not found.", goal_id)
             raise ValueError(f"Goal with ID {goal_id} not found.")
 
         try:
             exercises = fetch_recommendation(goal.target)
-            logger.info(f"Successfully found {len(exercises)} exercise(s) for goal with ID {goal_id}")
+            logger.info("Successfully found %s exercise(s) for goal with ID %s", len(exercises), goal_id)
             return exercises
         except RuntimeError as e:
-            logger.error(f"Failed to fetch exercise recommendations: {e}")
+            logger.error("Failed to fetch exercise recommendations: %s", e)
             raise
 
     @classmethod
-    def get_all_goals(cls) -> list[dict]:
+    def iter_all_goals(cls, sort_by_target: bool = False, batch_size: int = 500) -> Iterator[dict]:
+        """
+        Yields every goal in the database as a dictionary.
+
+        Rows are fetched from the cursor batch_size at a time, so memory stays
+        bounded by one batch however large the table grows.
+
+        Args:
+            sort_by_target (bool): If True, sort the goals by target. Defaults to sorting by ID.
+            batch_size (int): The number of rows fetched per round-trip. Defaults to 500.
+
+        Yields:
+            dict: One goal, keyed by column name.
+
+        Raises:
+            SQLAlchemyError: If any database error occurs.
+        """
+        stmt = _ALL_GOALS_STATEMENTS[bool(sort_by_target)]
+        for row in db.session.execute(stmt, execution_options={"yield_per": batch_size}).mappings():
+            yield dict(row)
+
+    @classmethod
+    def get_all_goals(cls, sort_by_target: bool = False) -> list[dict]:
         """
         Retrieves all goals from the database as dictionaries.
 
+        Rows are selected from the table and streamed in batches, so no ORM
+        instances are built for what ends up as plain dictionaries keyed by column.
+
+        Args:
+            sort_by_target (bool): If True, sort the goals by target. Defaults to sorting by ID.
+
         Returns:
             list[dict]: A list of dictionaries representing all goals.
 
@@ -475,29 +683,52 @@ class Goals(db.Model):
         logger.info("Attempting to retrieve all goals from the database")
 
         try:
-            goals = cls.query.all()
+            results = list(cls.iter_all_goals(sort_by_target))
 
-            if not goals:
+            # An empty table is already answered by the empty list
+            if results:
+                logger.info("Retrieved %s goals from the database", len(results))
+            else:
                 logger.warning("The goals table is empty.")
-                return []
-
-            results = [
-                {
-                    "id": goal.id,
-                    "target": goal.target,
-                    "goal_value": goal.goal_value,
-                    "goal_progress": goal.goal_progress,
-                    "completed": goal.completed,
-                    "progress_notes": goal.progress_notes
-                }
-                for goal in goals
-            ]
-
-            logger.info(f"Retrieved {len(results)} goals from the database")
             return results
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while retrieving all goals: {e}")
+            logger.error("Database error while retrieving all goals: %s", e)
+            raise
+
+    @classmethod
+    def get_goals_page(cls, after_id: Optional[int] = None, limit: int = 50) -> tuple[list[dict], Optional[int]]:
+        """
+        Retrieves one page of goals, ordered by ID, as dictionaries.
+
+        Pages are found by seeking past the last ID of the previous page rather
+        than with OFFSET, so every page costs the same primary-key range scan.
+
+        Args:
+            after_id (int, optional): The last goal ID of the previous page. Defaults to the first page.
+            limit (int): The maximum number of goals on the page. Defaults to 50.
+
+        Returns:
+            tuple[list[dict], int | None]: The goals on the page, and the after_id for the
+                next page, or None if this is the last page.
+
+        Raises:
+            ValueError: If limit is not a positive integer.
+            SQLAlchemyError: If any database error occurs.
+        """
+        if type(limit) is not int or limit < 1:
+            raise ValueError("limit must be a positive integer.")
+
+        logger.info("Attempting to retrieve %s goals after ID %s", limit, after_id)
+
+        try:
+            rows = db.session.execute(_GOALS_PAGE_STATEMENT, {"after_id": after_id or 0, "limit": limit}).mappings()
+            goals = [dict(row) for row in rows]
+            next_after_id = goals[-1]["id"] if len(goals) == limit else None
+            return goals, next_after_id
+
+        except SQLAlchemyError as e:
+            logger.error("Database error while retrieving a page of goals: %s", e)
             raise
 
 ##########################################
@@ -510,63 +741,75 @@ class Goals(db.Model):
         target: str = None,
         goal_value: int = None,
         goal_progress: Union[float, int] = None,
-        completed: bool = None
-    ) -> "Goals":
+        completed: bool = None,
+        return_goal: bool = True
+    ) -> Optional["Goals"]:
         """
         Updates a goal in the database by its ID.
 
+        The provided fields are written with a single UPDATE statement, without
+        loading the goal first.
+
         Args:
             goal_id (int): The ID of the goal to update.
             target (str, optional): The new target value.
             goal_value (int, optional): The new goal value.
             goal_progress ((float, int), optional): The new goal progress value.
             completed (bool, optional): The new completion status.
+            return_goal (bool, optional): If False, skip loading the updated goal. Defaults to True.
 
         Returns:
-            Goals: The updated goal instance.
+            Goals: The updated goal instance, or None if return_goal is False.
 
         Raises:
             ValueError: If the goal with the given ID does not exist or inputs are invalid.
             SQLAlchemyError: If a database error occurs.
         """
-        logger.info(f"Attempting to update goal with ID {goal_id}")
+        logger.info("Attempting to update goal with ID %s", goal_id)
+
+        # Update only provided fields
+        values = {}
+        if target is not None:
+            target = _clean(target)
+            _validate_field("target", target)
+            values["target"] = target
+
+        if goal_value is not None:
+            if not isinstance(goal_value, int):
+                raise ValueError("goal_value must be an integer.")
+            values["goal_value"] = goal_value
+
+        if completed is not None:
+            if not isinstance(completed, bool):
+                raise ValueError("completed must be a boolean.")
+            values["completed"] = completed
+
+        if goal_progress is not None:
+            if not isinstance(goal_progress, (float, int)):
+                raise ValueError("goal_progress must be a float or an int.")
+            values["goal_progress"] = goal_progress
+            # Reaching the goal value marks the goal completed; compare against the stored value if none was given
+            values["completed"] = case(
+                (literal(goal_progress) >= values.get("goal_value", cls.goal_value), True),
+                else_=values.get("completed", cls.completed)
+            )
 
-        try:
-            # Retrieve the goal by ID
-            goal = cls.query.get(goal_id)
+        if not values:
+            return cls.get_goal_by_id(goal_id) if return_goal else None
 
-            if not goal:
-                logger.warning(f"Goal with ID {goal_id} not found")
+        try:
+            rows = cls.query.filter_by(id=goal_id).update(values, synchronize_session=False)
+            if not rows:
+                logger.warning("Goal with ID %s not found", goal_id)
                 raise ValueError(f"Goal with ID {goal_id} not found")
 
-            # Update only provided fields
-            if target is not None:
-                goal.target = target.strip() if isinstance(target, str) else target
-
-            if goal_value is not None:
-                if not isinstance(goal_value, int):
-                    raise ValueError("goal_value must be an integer.")
-                goal.goal_value = goal_value
-
-            if goal_progress is not None:
-                if not isinstance(goal_progress, (float, int)):
-                    raise ValueError("goal_progress must be a float or an int.")
-                goal.goal_progress = goal_progress
-
-            if completed is not None:
-                if not isinstance(completed, bool):
-                    raise ValueError("completed must be a boolean.")
-                goal.completed = completed
-
-            if goal_progress is not None and goal_progress >= goal_value:
-                goal.completed = True
-
+            # Committing expires any loaded copy of the goal, so it is reloaded on next access
             db.session.commit()
-            logger.info(f"Successfully updated goal with ID {goal_id}")
-            return goal
+            logger.info("Successfully updated goal with ID %s", goal_id)
+            return db.session.get(cls, goal_id) if return_goal else None
 
         except SQLAlchemyError as e:
-            logger.error(f"Database error while updating goal with ID {goal_id}: {e}")
+            logger.error("Database error while updating goal with ID %s: %s", goal_id, e)
             db.session.rollback()
             raise
 
@@ -602,3 +845,67 @@ class Goals(db.Model):
 
         db.session.commit()
         return message
+
+
+# Built once so get_goals_by_field only binds the value; each field compiles a single time
+_FILTER_STATEMENTS = {
+    field: select(Goals).where(getattr(Goals, field) == bindparam("value"))
+    for field in _FILTER_FIELDS
+}
+
+# Catalog reads keyed by sort_by_target. Selecting the table itself keeps the dictionary
+# keys in step with the columns.
+_ALL_GOALS_STATEMENTS = {
+    False: select(Goals.__table__).order_by(Goals.id),
+    True: select(Goals.__table__).order_by(Goals.target),
+}
+
+# One IN (...) query for a batch of IDs; the list is expanded into placeholders at execution
+_GOALS_BY_IDS_STATEMENT = select(Goals).where(Goals.id.in_(bindparam("ids", expanding=True)))
+
+# Completed and total counts for a set of IDs, counted by the database
+_COUNT_COMPLETED_STATEMENT = select(
+    func.count(case((Goals.completed, 1))), func.count()
+).where(Goals.id.in_(bindparam("ids", expanding=True)))
+
+# Keyset page of the catalog: the rows after a given ID, in ID order
+_GOALS_PAGE_STATEMENT = (
+    select(Goals.__table__)
+    .where(Goals.id > bindparam("after_id"))
+    .order_by(Goals.id)
+    .limit(bindparam("limit"))
+)
+
+# Duplicates of the (target, goal_value) key are skipped by the database instead of raising,
+# with the same ON CONFLICT clause on every backend the app supports. Only the compound key
+# is ignored, so NOT NULL and CHECK violations still raise.
+_INSERT_IGNORING_DUPLICATES = {
+    "postgresql": postgresql.insert(Goals.__table__).on_conflict_do_nothing(index_elements=["target", "goal_value"]),
+    "sqlite": sqlite.insert(Goals.__table__).on_conflict_do_nothing(index_elements=["target", "goal_value"]),
+}
+
+
+def _insert_ignoring_duplicates():
+    """Returns the duplicate-skipping goal INSERT for the session's database."""
+    dialect = db.session.get_bind().dialect.name
+    # Other backends get a plain INSERT, and duplicates reach the IntegrityError handlers
+    return _INSERT_IGNORING_DUPLICATES.get(dialect, insert(Goals.__table__))
+
+
+def _raise_on_lazy_load(stmt):
+    """Returns the statement with lazy loads of the loaded goals' relationships made to raise."""
+    return stmt.options(raiseload("*"))
+
+
+def guard_lazy_loads() -> None:
+    """Makes the prebuilt goal queries raise on any lazy relationship load.
+
+    Called once at app creation in debug mode, so a relationship added to Goals
+    later and read per goal fails loudly in development instead of shipping an
+    N+1 query. The catalog reads select the table itself and build no ORM
+    instances, so only the entity queries need the guard.
+
+    """
+    global _FILTER_STATEMENTS, _GOALS_BY_IDS_STATEMENT
+    _FILTER_STATEMENTS = {field: _raise_on_lazy_load(stmt) for field, stmt in _FILTER_STATEMENTS.items()}
+    _GOALS_BY_IDS_STATEMENT = _raise_on_lazy_load(_GOALS_BY_IDS_STATEMENT)
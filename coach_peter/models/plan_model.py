@@ -1,31 +1,114 @@
 import logging
 import os
-import time
-from typing import List
+from typing import Dict, List, Tuple
 
 from coach_peter.models.goal_model import Goals
+from coach_peter.utils.cache_utils import TTLCache
 from coach_peter.utils.logger import configure_logger
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+class _GoalIdList(list):
+    """A list of goal IDs that also keeps a set of them for O(1) membership tests.
+
+    Every mutating list method keeps the set in step, so the plan can still be
+    read and modified like a normal list.
+
+    """
+
+    def __init__(self, goal_ids=()):
+        super().__init__(goal_ids)
+        self._ids = set(self)
+
+    def __contains__(self, goal_id) -> bool:
+        return goal_id in self._ids
+
+    def append(self, goal_id) -> None:
+        super().append(goal_id)
+        self._ids.add(goal_id)
+
+    def extend(self, goal_ids) -> None:
+        goal_ids = list(goal_ids)
+        super().extend(goal_ids)
+        self._ids.update(goal_ids)
+
+    def __iadd__(self, goal_ids):
+        self.extend(goal_ids)
+        return self
+
+    def remove(self, goal_id) -> None:
+        super().remove(goal_id)
+        if not super().__contains__(goal_id):
+            self._ids.discard(goal_id)
+
+    def clear(self) -> None:
+        super().clear()
+        self._ids.clear()
+
+    def _resync(self) -> None:
+        self._ids = set(self)
+
+    # Rarely used mutators just rebuild the set afterwards
+    def insert(self, index, goal_id) -> None:
+        super().insert(index, goal_id)
+        self._ids.add(goal_id)
+
+    def pop(self, index=-1):
+        goal_id = super().pop(index)
+        self._resync()
+        return goal_id
+
+    def __setitem__(self, index, value) -> None:
+        super().__setitem__(index, value)
+        self._resync()
+
+    def __delitem__(self, index) -> None:
+        super().__delitem__(index)
+        self._resync()
+
+    def __imul__(self, count):
+        # plan *= 0 empties the list, so the set has to follow
+        super().__imul__(count)
+        self._resync()
+        return self
+
+
 class PlanModel:
     """
     A class to manage a fitness plan consisting of goals.
 
     """
 
+    # One plan is kept per logged-in user, so skip the per-instance __dict__
+    __slots__ = ("_plan", "_goal_cache", "version")
+
     def __init__(self):
         """Initializes the PlanModel with an empty plan (and the current track set to 1).
 
         The plan is a list of Goals(, and the current track number is 1-indexed).
-        (The TTL (Time To Live) for goal caching is set to a default value from the environment variable "TTL",
-        which defaults to 60 seconds if not set.)
+        The TTL (Time To Live) for goal caching is set to a default value from the environment variable "TTL",
+        which defaults to 60 seconds if not set. At most "GOAL_CACHE_SIZE" goals (default 128) are cached.
 
         """
-        self.plan: List[int] = []
-        self._goal_cache: dict[int, Goals] = {}
+        self.plan = []
+        # Bounded so a long-lived plan cannot accumulate goals without limit
+        self._goal_cache = TTLCache(
+            ttl=int(os.getenv("TTL", 60)),
+            maxsize=int(os.getenv("GOAL_CACHE_SIZE", 128))
+        )
+        # Bumped on every change to the plan so callers can tell when cached views are stale
+        self.version = 0
+
+    @property
+    def plan(self) -> List[int]:
+        """The goal IDs in the plan, in order."""
+        return self._plan
+
+    @plan.setter
+    def plan(self, goal_ids: List[int]) -> None:
+        self._plan = _GoalIdList(goal_ids)
 
     ##################################################
     # Goal Management Functions
@@ -47,46 +130,48 @@ class PlanModel:
         Raises:
             ValueError: If the goal cannot be found in the database.
         """
-        if goal_id in self._goal_cache:
-            logger.debug(f"Goal ID {goal_id} retrieved from cache")
-            return self._goal_cache[goal_id]
+        goal = self._goal_cache.get(goal_id)
+        if goal is not None:
+            # Cache hits are the hot path, so skip the logging call entirely unless debugging
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Goal ID %s retrieved from cache", goal_id)
+            return goal
 
         try:
             goal = Goals.get_goal_by_id(goal_id)
-            logger.info(f"Goal ID {goal_id} loaded from DB")
+            logger.info("Goal ID %s loaded from DB", goal_id)
         except ValueError as e:
-            logger.error(f"Goal ID {goal_id} not found in DB: {e}")
+            logger.error("Goal ID %s not found in DB: %s", goal_id, e)
             raise ValueError(f"Goal ID {goal_id} not found in database") from e
 
-        self._goal_cache[goal_id] = goal
+        self._goal_cache.set(goal_id, goal)
         return goal
 
-    def add_goal_to_plan(self, goal_id: int) -> None:
+    def add_goal_to_plan(self, goal_id: int) -> Goals:
         """
         Adds a goal to the plan by ID, using the cache or database lookup.
 
         Args:
             goal_id (int): The ID of the goal to add to the plan.
 
+        Returns:
+            Goals: The goal that was added.
+
         Raises:
             ValueError: If the goal ID is invalid or already exists in the plan.
         """
-        logger.info(f"Received request to add goal with ID {goal_id} to the plan")
+        logger.info("Received request to add goal with ID %s to the plan", goal_id)
 
-        goal_id = self.validate_goal_id(goal_id, check_in_plan=False)
+        goal_id, goal = self._get_valid_goal(goal_id, check_in_plan=False)
 
         if goal_id in self.plan:
-            logger.error(f"Goal with ID {goal_id} already exists in the plan")
+            logger.error("Goal with ID %s already exists in the plan", goal_id)
             raise ValueError(f"Goal with ID {goal_id} already exists in the plan")
 
-        try:
-            goal = self._get_goal_from_cache_or_db(goal_id)
-        except ValueError as e:
-            logger.error(f"Failed to add goal: {e}")
-            raise
-
         self.plan.append(goal.id)
-        logger.info(f"Successfully added to plan: {goal.target}")
+        self.version += 1
+        logger.info("Successfully added to plan: %s", goal.target)
+        return goal
 
 
     def remove_goal_by_goal_id(self, goal_id: int) -> None:
@@ -99,17 +184,15 @@ class PlanModel:
             ValueError: If the plan is empty or the goal ID is invalid.
 
         """
-        logger.info(f"Received request to remove goal with ID {goal_id}")
+        logger.info("Received request to remove goal with ID %s", goal_id)
 
         self.check_if_empty()
-        goal_id = self.validate_goal_id(goal_id)
-
-        if goal_id not in self.plan:
-            logger.warning(f"Goal with ID {goal_id} not found in the plan")
-            raise ValueError(f"Goal with ID {goal_id} not found in the plan")
+        # Removing only needs the ID to be in the plan, so skip loading the goal
+        goal_id = self._check_goal_id(goal_id)
 
         self.plan.remove(goal_id)
-        logger.info(f"Successfully removed goal with ID {goal_id} from the plan")
+        self.version += 1
+        logger.info("Successfully removed goal with ID %s from the plan", goal_id)
 
 
     def clear_plan(self) -> None:
@@ -120,13 +203,12 @@ class PlanModel:
         """
         logger.info("Received request to clear the plan")
 
-        try:
-            if self.check_if_empty():
-                pass
-        except ValueError:
+        if not self.plan:
             logger.warning("Clearing an empty plan")
 
         self.plan.clear()
+        self._goal_cache.clear()
+        self.version += 1
         logger.info("Successfully cleared the plan")
 
 
@@ -141,13 +223,62 @@ class PlanModel:
         Returns:
             List[goal]: A list of all goals in the plan.
 
+        Raises:
+            ValueError: If the plan is empty or a goal in it no longer exists.
+        """
+        logger.info("Retrieving all goals in the plan: %s", self.plan)
+        self.check_if_empty()
+
+        goals = self._load_goals(self.plan)
+        return [goals[goal_id] for goal_id in self.plan]
+
+    def _load_goals(self, goal_ids: List[int]) -> Dict[int, Goals]:
+        """Returns the given goals by ID, loading every uncached one with a single query.
+
+        The result is built from the cache hits and the query's rows directly, so it
+        stays complete even when the cache is too small to hold all of them.
+
+        Args:
+            goal_ids (List[int]): The goal IDs to load.
+
+        Returns:
+            Dict[int, Goals]: The goals keyed by ID.
+
+        Raises:
+            ValueError: If a goal is neither cached nor in the database.
+        """
+        goals = {}
+        missing = []
+        for goal_id in goal_ids:
+            goal = self._goal_cache.get(goal_id)
+            if goal is None:
+                missing.append(goal_id)
+            else:
+                goals[goal_id] = goal
+        if not missing:
+            return goals
+
+        for goal in Goals.get_goals_by_ids(missing):
+            goals[goal.id] = goal
+            self._goal_cache.set(goal.id, goal)
+
+        for goal_id in missing:
+            if goal_id not in goals:
+                logger.error("Goal ID %s not found in DB", goal_id)
+                raise ValueError(f"Goal ID {goal_id} not found in database")
+        return goals
+
+    def get_goal_ids(self) -> List[int]:
+        """Returns the IDs of the goals in the plan without loading the goals.
+
+        Returns:
+            List[int]: A copy of the goal IDs in plan order.
+
         Raises:
             ValueError: If the plan is empty.
         """
-        logger.info(f"Retrieving all goals in the plan: {self.plan}")
         self.check_if_empty()
-        
-        return [self._get_goal_from_cache_or_db(goal_id) for goal_id in self.plan]
+        return list(self.plan)
 
     def get_goal_by_goal_id(self, goal_id: int) -> Goals:
         """Retrieves a goal from the plan by its goal ID using the cache or DB.
@@ -162,10 +293,9 @@ class PlanModel:
             ValueError: If the plan is empty or the goal is not found.
         """
         self.check_if_empty()
-        goal_id = self.validate_goal_id(goal_id)
-        logger.info(f"Retrieving goal with ID {goal_id} from the plan")
-        goal = self._get_goal_from_cache_or_db(goal_id)
-        logger.info(f"Successfully retrieved goal: ")
+        goal_id, goal = self._get_valid_goal(goal_id)
+        logger.info("Retrieving goal with ID %s from the plan", goal_id)
+        logger.info("Successfully retrieved goal: %s", goal.target)
         return goal
 
     def get_plan_length(self) -> int:
@@ -175,9 +305,7 @@ class PlanModel:
             int: The total number of goals in the plan.
 
         """
-        length = len(self.plan)
-        logger.info(f"Retrieving plan length: {length} goals")
-        return length
+        return len(self.plan)
     
     def get_plan_progress(self) -> float:
         """Returns percentage of the goals completed in the plan.
@@ -186,21 +314,19 @@ class PlanModel:
             float: The percentage of the goals completed in the plan.
 
         Raises:
-            ValueError: If the plan is empty
+            ValueError: If the plan is empty or a goal in it no longer exists
         """
         self.check_if_empty()
-        completed = 0
         length = len(self.plan)
-        logger.info(f"Retrieving number of completed goals {self.plan}")
+        logger.info("Retrieving number of completed goals %s", self.plan)
 
-        for goal_id in self.plan:
-            goal = Goals.get_goal_by_id(goal_id)
-            if goal.completed:
-                completed += 1
+        completed, total = Goals.count_completed(self.plan)
+        if total != length:
+            logger.error("%s goals in the plan were not found in the database", length - total)
+            raise ValueError("Plan contains goals that were not found in the database")
 
-        
         percentage: float = round(completed / length, 3)
-        logger.info(f"User has completed {percentage}% of their goals!")
+        logger.info("User has completed %.1f%% of their goals!", percentage * 100)
         return percentage
 
     ##################################################
@@ -232,24 +358,45 @@ class PlanModel:
                         not found in the plan (if check_in_plan=True),
                         or not found in the database.
         """
+        return self._get_valid_goal(goal_id, check_in_plan)[0]
+
+    def _get_valid_goal(self, goal_id: int, check_in_plan: bool = True) -> Tuple[int, Goals]:
+        """Validates the given goal ID and returns it with the goal it refers to.
+
+        Callers that need the goal use this instead of validate_goal_id, so it
+        is looked up once per operation.
+
+        Raises:
+            ValueError: For the same reasons as validate_goal_id.
+        """
+        goal_id = self._check_goal_id(goal_id, check_in_plan)
+
+        try:
+            goal = self._get_goal_from_cache_or_db(goal_id)
+        except Exception as e:
+            logger.error("Goal with id %s not found in database: %s", goal_id, e)
+            raise ValueError(f"Goal with id {goal_id} not found in database")
+
+        return goal_id, goal
+
+    def _check_goal_id(self, goal_id: int, check_in_plan: bool = True) -> int:
+        """Checks the goal ID is a non-negative integer and, optionally, in the plan, without a database lookup.
+
+        Raises:
+            ValueError: If the goal ID is invalid or, with check_in_plan, not in the plan.
+        """
         try:
             goal_id = int(goal_id)
             if goal_id < 0:
                 raise ValueError
         except ValueError:
-            logger.error(f"Invalid goal id: {goal_id}")
+            logger.error("Invalid goal id: %s", goal_id)
             raise ValueError(f"Invalid goal id: {goal_id}")
 
         if check_in_plan and goal_id not in self.plan:
-            logger.error(f"Goal with id {goal_id} not found in plan")
+            logger.error("Goal with id %s not found in plan", goal_id)
             raise ValueError(f"Goal with id {goal_id} not found in plan")
 
-        try:
-            self._get_goal_from_cache_or_db(goal_id)
-        except Exception as e:
-            logger.error(f"Goal with id {goal_id} not found in database: {e}")
-            raise ValueError(f"Goal with id {goal_id} not found in database")
-
         return goal_id
 
     def check_if_empty(self) -> None:
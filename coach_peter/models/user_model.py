@@ -1,6 +1,8 @@
 import hashlib
+import hmac
 import logging
 import os
+from typing import Optional
 
 from flask_login import UserMixin
 from sqlalchemy.exc import IntegrityError
@@ -15,6 +17,8 @@ configure_logger(logger)
 
 class Users(db.Model, UserMixin):
     __tablename__ = 'users'
+    # Ids are the session login key, so SQLite must never hand a deleted user's id out again
+    __table_args__ = {"sqlite_autoincrement": True}
 
     id = db.Column(db.Integer, primary_key=True)
     username = db.Column(db.String(80), unique=True, nullable=False)
@@ -33,9 +37,23 @@ class Users(db.Model, UserMixin):
             tuple: A tuple containing the salt and hashed password.
         """
         salt = os.urandom(16).hex()
-        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        hashed_password = Users._hash_password(password, salt)
         return salt, hashed_password
 
+    @staticmethod
+    def _hash_password(password: str, salt: str) -> str:
+        """
+        Hashes a password with the given salt.
+
+        Args:
+            password (str): The password to hash.
+            salt (str): The salt in hex.
+
+        Returns:
+            str: The SHA-256 hash in hex.
+        """
+        return hashlib.sha256((password + salt).encode()).hexdigest()
+
     @classmethod
     def create_user(cls, username: str, password: str) -> None:
         """
@@ -60,20 +78,20 @@ class Users(db.Model, UserMixin):
             raise ValueError(f"User with username '{username}' already exists")
         except Exception as e:
             db.session.rollback()
-            logger.error("Database error: %s", str(e))
+            logger.error("Database error: %s", e)
             raise
 
     @classmethod
-    def check_password(cls, username: str, password: str) -> bool:
+    def authenticate(cls, username: str, password: str) -> Optional["Users"]:
         """
-        Check if a given password matches the stored password for a user.
+        Fetch a user and check their password with a single lookup.
 
         Args:
             username (str): The username of the user.
             password (str): The password to check.
 
         Returns:
-            bool: True if the password is correct, False otherwise.
+            Users: The user if the password is correct, None otherwise.
 
         Raises:
             ValueError: If the user does not exist.
@@ -82,9 +100,29 @@ class Users(db.Model, UserMixin):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
+        # Constant-time comparison so response timing doesn't leak how much of the hash matched
+        if not hmac.compare_digest(cls._hash_password(password, user.salt), user.password):
+            logger.info("Password is incorrect for user %s", username)
+            return None
         logger.info("Password is correct")
-        return hashed_password == user.password
+        return user
+
+    @classmethod
+    def check_password(cls, username: str, password: str) -> bool:
+        """
+        Check if a given password matches the stored password for a user.
+
+        Args:
+            username (str): The username of the user.
+            password (str): The password to check.
+
+        Returns:
+            bool: True if the password is correct, False otherwise.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        return cls.authenticate(username, password) is not None
 
     @classmethod
     def delete_user(cls, username: str) -> None:
@@ -107,12 +145,12 @@ class Users(db.Model, UserMixin):
 
     def get_id(self) -> str:
         """
-        Get the ID of the user.
+        Get the ID of the user used as the Flask-Login session key.
 
         Returns:
-            int: The ID of the user.
+            str: The primary key of the user as a string.
         """
-        return self.username
+        return str(self.id)
 
     @classmethod
     def get_id_by_username(cls, username: str) -> int:
@@ -132,7 +170,7 @@ class Users(db.Model, UserMixin):
         if not user:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        logger.info(f"User {username} has ID {user.id}")
+        logger.info("User %s has ID %s", username, user.id)
         return user.id
 
     @classmethod
@@ -1,8 +1,14 @@
 import logging
 import os
+import threading
+from concurrent.futures import Future
+
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+from coach_peter.utils.cache_utils import TTLCache
 from coach_peter.utils.logger import configure_logger
 
 load_dotenv()
@@ -13,42 +19,125 @@ EXERCISE_DB_API_KEY = os.getenv("EXERCISE_DB_API_KEY")
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
+# One shared session keeps connections to the API alive between calls, so only
+# the first request pays for the TCP and TLS handshakes
+_SESSION = requests.Session()
+_SESSION.headers.update({
+    "X-RapidAPI-Key": EXERCISE_DB_API_KEY,
+    "X-RapidAPI-Host": "exercisedb.p.rapidapi.com"
+})
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+))
+
+# Exercise lists per target change rarely, so keep them for an hour by default
+_recommendation_cache = TTLCache(ttl=int(os.getenv("RECOMMENDATION_TTL", 3600)), maxsize=32)
+
+# Futures for the recommendation requests currently in flight, by target
+_inflight: dict[str, Future] = {}
+_inflight_lock = threading.Lock()
+
+# Validators and parsed bodies of past responses, so a repeat request can be
+# answered with a bodiless 304 once the data is known
+_etag_cache = TTLCache(ttl=86400, maxsize=64)
+
 def fetch_data(url, params=None):
-    logger.info(f"{EXERCISE_DB_API_KEY}")
-    headers = {
-        "X-RapidAPI-Key": EXERCISE_DB_API_KEY,
-        "X-RapidAPI-Host": "exercisedb.p.rapidapi.com"
-    }
+    key = (url, frozenset(params.items()) if params else None)
+    cached = _etag_cache.get(key)
     try:
-        logger.info(f"Fetching data from {url} with params {params}")
-        response = requests.get(url, headers=headers, params=params, timeout=5)
+        logger.info("Fetching data from %s with params %s", url, params)
+        if cached is None:
+            response = _SESSION.get(url, params=params, timeout=5)
+        else:
+            response = _SESSION.get(url, params=params, headers=cached[0], timeout=5)
         response.raise_for_status()
-        return response.json()
+
+        if cached is not None and response.status_code == 304:
+            logger.info("Data at %s not modified, using cached response", url)
+            return cached[1]
+
+        data = response.json()
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if validators:
+            _etag_cache.set(key, (validators, data))
+        return data
     except requests.exceptions.Timeout:
         logger.error("Request timed out.")
         raise RuntimeError("Request timed out.")
     except requests.exceptions.RequestException as e:
-        logger.error(f"Request failed: {e}")
+        logger.error("Request failed: %s", e)
         raise RuntimeError(f"Request failed: {e}")
 
 def fetch_recommendation(target):
     """
     Fetch exercises from the ExerciseDB API based on the target that the user wants to exercise.
 
+    Results are cached per target for RECOMMENDATION_TTL seconds, so only the
+    first request for a target within that window calls the API. Concurrent
+    requests for a target that is not cached yet share one API call.
+
     Args:
         target (str): Target for goal (e.g., 'biceps', 'pectorals', 'cardiovascular system').
 
     Returns:
         list: List of exercises matching the target value.
     """
+    exercises = _recommendation_cache.get(target)
+    if exercises is not None:
+        logger.info("Using cached exercises for body part: %s", target)
+        return list(exercises)
+
+    # The first caller for a target makes the API call; callers arriving while it
+    # is in flight wait on its result instead of making their own
+    with _inflight_lock:
+        # Check again under the lock: a leader that finished since the check above
+        # has already cached its result and dropped its in-flight entry
+        exercises = _recommendation_cache.get(target)
+        if exercises is not None:
+            return list(exercises)
+        future = _inflight.get(target)
+        leader = future is None
+        if leader:
+            future = _inflight[target] = Future()
+
+    if not leader:
+        logger.info("Waiting on in-flight request for body part: %s", target)
+        return list(future.result())
+
+    try:
+        exercises = _fetch_recommendation_uncached(target)
+    except BaseException as e:
+        future.set_exception(e)
+        raise
+    else:
+        future.set_result(exercises)
+    finally:
+        with _inflight_lock:
+            del _inflight[target]
+    return list(exercises)
+
+def _fetch_recommendation_uncached(target):
+    """Fetches the exercises for a target from the API and caches them."""
     url = f"{BASE_URL}/exercises/target/{target}/?limit=1"
 
     exercises = fetch_data(url)
 
     if not exercises:
-        logger.error(f"No exercises found for body part: {target}")
+        logger.error("No exercises found for body part: %s", target)
         raise ValueError(f"No exercises found for body part: {target}")
     else:
-        logger.info(f"Found {len(exercises)} exercises for body part: {target}")
+        logger.info("Found %s exercises for body part: %s", len(exercises), target)
 
+    _recommendation_cache.set(target, exercises)
     return exercises
+
+def clear_recommendation_cache():
+    """Drops every cached exercise list and response validator, so the next request for each target fetches it in full."""
+    _recommendation_cache.clear()
+    _etag_cache.clear()
@@ -0,0 +1,106 @@
+import logging
+import threading
+import time
+from typing import Any, Hashable
+
+from coach_peter.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class TTLCache:
+    """
+    A small thread-safe in-memory cache whose entries expire after a fixed time to live.
+
+    Entries are evicted lazily on read once they expire, swept out every
+    SWEEP_INTERVAL writes, and the oldest entry is dropped when the cache is full.
+
+    """
+
+    # Writes between sweeps for expired entries
+    SWEEP_INTERVAL = 256
+
+    def __init__(self, ttl: float = 60, maxsize: int = 1024):
+        """Initializes the cache.
+
+        Args:
+            ttl (float): Seconds an entry stays valid. Defaults to 60.
+            maxsize (int): Maximum number of entries kept. Defaults to 1024.
+
+        """
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data: dict[Hashable, tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        self._writes_since_sweep = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Returns the cached value for a key, or the default if it is missing or expired.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any, optional): Value returned on a miss. Defaults to None.
+
+        Returns:
+            Any: The cached value or the default.
+
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value under a key for the cache's TTL.
+
+        Args:
+            key (Hashable): The cache key.
+            value (Any): The value to store.
+
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._writes_since_sweep += 1
+            if self._writes_since_sweep >= self.SWEEP_INTERVAL:
+                # Drop entries nobody has read since they expired; amortized over the writes
+                self._writes_since_sweep = 0
+                expired = [k for k, (_, expires_at) in self._data.items() if expires_at <= now]
+                for k in expired:
+                    del self._data[k]
+
+            self._data.pop(key, None)
+            if len(self._data) >= self.maxsize:
+                # Dicts keep insertion order, so the first key is the oldest entry
+                del self._data[next(iter(self._data))]
+            self._data[key] = (value, now + self.ttl)
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Removes a key from the cache.
+
+        Args:
+            key (Hashable): The cache key.
+            default (Any, optional): Value returned if the key is missing. Defaults to None.
+
+        Returns:
+            Any: The removed value or the default.
+
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return default if entry is None else entry[0]
+
+    def clear(self) -> None:
+        """Removes every entry from the cache."""
+        with self._lock:
+            self._data.clear()
+        logger.debug("Cache cleared")
+
+    def __len__(self) -> int:
+        return len(self._data)
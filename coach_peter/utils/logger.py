@@ -1,26 +1,71 @@
+import atexit
 import logging
+import os
+import queue
 import sys
+import threading
+from logging.handlers import QueueHandler, QueueListener
 
 from flask import current_app, has_request_context
 
 
+# Loggers only enqueue records; a single background listener writes them to stderr
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            return
+
+        # Create a console handler that logs to stderr
+        handler = logging.StreamHandler(sys.stderr)
+        handler.setLevel(logging.DEBUG)
+
+        # Create a formatter with a timestamp
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        handler.setFormatter(formatter)
+
+        _listener = QueueListener(_log_queue, handler, respect_handler_level=True)
+        _listener.start()
+        # Drain whatever is still queued when the process exits
+        atexit.register(_listener.stop)
+
+
+def _log_level() -> int:
+    """Returns the level named by LOG_LEVEL (e.g. DEBUG or WARNING), defaulting to INFO."""
+    level = logging.getLevelName(os.getenv("LOG_LEVEL", "INFO").upper())
+    # getLevelName hands back a "Level X" string for names it doesn't know
+    return level if isinstance(level, int) else logging.INFO
+
+
 def configure_logger(logger):
-    logger.setLevel(logging.DEBUG)  # Set the desired logging level here
+    """Attaches the shared queue handler to a logger and sets its level from LOG_LEVEL.
+
+    Records below the level are dropped before they are built, which is what
+    the callers' isEnabledFor guards rely on.
 
-    # Create a console handler that logs to stderr
-    handler = logging.StreamHandler(sys.stderr)
-    handler.setLevel(logging.DEBUG)
+    Safe to call more than once on the same logger (e.g. when a module is
+    reloaded): handlers that are already attached are not added again, so
+    each record is still written exactly once.
 
-    # Create a formatter with a timestamp
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    """
+    logger.setLevel(_log_level())
 
-    # Add the formatter to the handler
-    handler.setFormatter(formatter)
+    # Hand records to the queue so the calling thread never blocks on the write
+    _start_listener()
+    if not any(isinstance(h, QueueHandler) and h.queue is _log_queue for h in logger.handlers):
+        handler = QueueHandler(_log_queue)
+        handler.setLevel(logging.DEBUG)
 
-    # Add the handler to the logger
-    logger.addHandler(handler)
+        # Add the handler to the logger
+        logger.addHandler(handler)
 
     if has_request_context():
         app_logger = current_app.logger
         for handler in app_logger.handlers:
-            logger.addHandler(handler)
\ No newline at end of file
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
@@ -23,7 +23,7 @@ def check_database_connection():
 
     """
     try:
-        logger.info(f"Checking database connection to {DB_PATH}...")
+        logger.info("Checking database connection to %s...", DB_PATH)
 
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
@@ -51,7 +51,7 @@ def check_table_exists(tablename: str):
 
     """
     try:
-        logger.info(f"Checking if table '{tablename}' exists in {DB_PATH}...")
+        logger.info("Checking if table '%s' exists in %s...", tablename, DB_PATH)
 
         conn = sqlite3.connect(DB_PATH)
         cursor = conn.cursor()
@@ -67,7 +67,7 @@ def check_table_exists(tablename: str):
             logger.error(error_message)
             raise Exception(error_message)
 
-        logger.info(f"Table '{tablename}' exists.")
+        logger.info("Table '%s' exists.", tablename)
 
     except sqlite3.Error as e:
         error_message = f"Table check error for '{tablename}': {e}"
@@ -87,11 +87,11 @@ def get_db_connection():
     """
     conn = None
     try:
-        logger.info(f"Opening database connection to {DB_PATH}...")
+        logger.info("Opening database connection to %s...", DB_PATH)
         conn = sqlite3.connect(DB_PATH)
         yield conn
     except sqlite3.Error as e:
-        logger.error(f"Database connection error: {e}")
+        logger.error("Database connection error: %s", e)
         raise e
     finally:
         if conn:
@@ -12,9 +12,22 @@ class ProductionConfig():
     SECRET_KEY = os.getenv("SECRET_KEY", "test-secret-key")  # Default secret key for testing
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_ECHO = False
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        "query_cache_size": 1200,  # Compiled-statement cache shared by all ORM queries
+        "pool_pre_ping": True,
+        # Enough connections for every gunicorn thread, with overflow for bursts
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        "pool_recycle": 3600,
+        # Reuse the most recently returned connection so a small warm set serves most requests
+        "pool_use_lifo": True,
+    }
     SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', "sqlite:////app/db/app.db")  # Production database URI from environment
+    # Set to false once the schema exists so workers start without reflecting every table
+    AUTO_CREATE_TABLES = os.getenv("AUTO_CREATE_TABLES", "true").lower() == "true"
 
 class TestConfig():
     """Testing configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # Use in-memory database for tests
+    SECRET_KEY = "test-secret-key"  # Signs the session cookies the route tests log in with
@@ -13,5 +13,5 @@ else
     echo "Skipping database creation."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the application under gunicorn (one worker: plans live in process memory)
+exec gunicorn --workers 1 --worker-class gthread --threads 8 --bind 0.0.0.0:5000 wsgi:app
@@ -1,153 +1,233 @@
+import argparse
+import json
+from operator import itemgetter
+from urllib.parse import urlsplit
+
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+_GOAL_BICEPS = {
+    "target": "biceps",
+    "goal_value": 40,
+    "goal_progress": 35.0,
+    "completed": False,
+    "progress_notes": "[]"
+}
+
+_UPDATED_BICEPS = {
+    "target": "biceps",
+    "goal_value": 40,
+    "goal_progress": 40.0,
+    "completed": True,
+    "progress_notes": "[]"
+}
+
+_GOAL_PECS = {
+    "target": "pectorals",
+    "goal_value": 200,
+    "goal_progress": 225.0,
+    "completed": True,
+    "progress_ntoes": "[]"
+}
+
+_EXAMPLE_WORKOUT = {
+    "amount": 25.0,
+    "exercise_type": "Push-up",
+    "duration": 30,
+    "intensity": "High",
+    "note": ""
+}
+
+_USERNAME = "test"
+_PASSWORD = "test"
+_NEW_PASSWORD = "new_password"
+
+# Request bodies are encoded once up front; the pecs goal and the original
+# credentials (create-user, then login) are each sent twice
+_JSON_HEADERS = {"Content-Type": "application/json"}
+_CREDENTIALS_BODY = json.dumps({"username": _USERNAME, "password": _PASSWORD}).encode()
+_NEW_PASSWORD_BODY = json.dumps({"new_password": _NEW_PASSWORD}).encode()
+_NEW_CREDENTIALS_BODY = json.dumps({"username": _USERNAME, "password": _NEW_PASSWORD}).encode()
+_GOAL_BICEPS_BODY = json.dumps(_GOAL_BICEPS).encode()
+_UPDATED_BICEPS_BODY = json.dumps(_UPDATED_BICEPS).encode()
+_GOAL_PECS_BODY = json.dumps(_GOAL_PECS).encode()
+_EXAMPLE_WORKOUT_BODY = json.dumps(_EXAMPLE_WORKOUT).encode()
+
+
+def _build_session():
+    """Return the requests session used to smoke test a running server."""
+    # One session for the whole run, so every request reuses the same keep-alive connection
+    session = requests.Session()
+    # Retry transient gateway errors on idempotent requests instead of failing the whole run;
+    # POST and PATCH are left out so a retry can't create or update a goal twice
+    adapter = HTTPAdapter(
+        pool_connections=2,
+        pool_maxsize=8,
+        max_retries=Retry(total=2, backoff_factor=0.05, status_forcelist=(502, 503, 504))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class _FlaskResponse:
+    """Gives a Flask test response the status_code/json() interface the smoketest uses."""
+
+    def __init__(self, response):
+        self.status_code = response.status_code
+        self._response = response
+
+    def json(self):
+        return self._response.get_json()
+
+
+class FlaskClientAdapter:
+    """Runs the smoketest's requests through a Flask test client instead of real sockets.
+
+    URLs keep their full form in the smoketest; only the path and query are passed on.
+
+    """
+
+    def __init__(self, client):
+        self._client = client
+
+    def _request(self, method, url, **kwargs):
+        parts = urlsplit(url)
+        path = f"{parts.path}?{parts.query}" if parts.query else parts.path
+        return _FlaskResponse(self._client.open(path, method=method, **kwargs))
+
+    def get(self, url, **kwargs):
+        return self._request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self._request("POST", url, **kwargs)
+
+    def put(self, url, **kwargs):
+        return self._request("PUT", url, **kwargs)
+
+    def patch(self, url, **kwargs):
+        return self._request("PATCH", url, **kwargs)
+
+    def delete(self, url, **kwargs):
+        return self._request("DELETE", url, **kwargs)
 
 
-def run_smoketest():
+def _build_local_client():
+    """Return an in-process client for a fresh app on an in-memory database."""
+    from app import create_app
+    from config import TestConfig
+
+    class SmoketestConfig(TestConfig):
+        SECRET_KEY = "smoketest-secret-key"
+        AUTO_CREATE_TABLES = True
+
+    return FlaskClientAdapter(create_app(SmoketestConfig).test_client())
+
+
+def run_smoketest(session=None):
+    """Run the smoketest over the given client, by default a requests session against localhost:5000."""
     base_url = "http://localhost:5000/api"
-    username = "test"
-    password = "test"
-
-
-    goal_biceps = {
-        "target": "biceps",
-        "goal_value": 40,
-        "goal_progress": 35.0,
-        "completed": False,
-        "progress_notes": "[]"
-    }
-
-    updated_biceps = {
-        "target": "biceps",
-        "goal_value": 40,
-        "goal_progress": 40.0,
-        "completed": True,
-        "progress_notes": "[]"
-    }
-
-    goal_pecs = {
-        "target": "pectorals",
-        "goal_value": 200,
-        "goal_progress": 225.0,
-        "completed": True,
-        "progress_ntoes": "[]"
-    }
-
-    example_workout = {
-        "amount": 25.0,
-        "exercise_type": "Push-up",
-        "duration": 30,
-        "intensity": "High",
-        "note": ""
-    }
-
-    health_response = requests.get(f"{base_url}/health")
+
+    if session is None:
+        session = _build_session()
+
+    health_response = session.get(f"{base_url}/health")
     assert health_response.status_code == 200
     assert health_response.json()["status"] == "success"
 
-    delete_user_response = requests.delete(f"{base_url}/reset-users")
+    delete_user_response = session.delete(f"{base_url}/reset-users")
     assert delete_user_response.status_code == 200
     assert delete_user_response.json()["status"] == "success"
     print("Reset users successful")
 
-    delete_goal_response = requests.delete(f"{base_url}/reset-goals")
+    delete_goal_response = session.delete(f"{base_url}/reset-goals")
     assert delete_goal_response.status_code == 200
     assert delete_goal_response.json()["status"] == "success"
     print("Reset goal successful")
 
-    create_user_response = requests.put(f"{base_url}/create-user", json={
-        "username": username,
-        "password": password
-    })
+    create_user_response = session.put(f"{base_url}/create-user", data=_CREDENTIALS_BODY, headers=_JSON_HEADERS)
     assert create_user_response.status_code == 201
     assert create_user_response.json()["status"] == "success"
     print("User creation successful")
 
-    session = requests.Session()
-
     # Log in
-    login_resp = session.post(f"{base_url}/login", json={
-        "username": username,
-        "password": password
-    })
+    login_resp = session.post(f"{base_url}/login", data=_CREDENTIALS_BODY, headers=_JSON_HEADERS)
     assert login_resp.status_code == 200
     assert login_resp.json()["status"] == "success"
     print("Login successful")
 
     biceps_id = 1
-    create_biceps_resp = session.post(f"{base_url}/create-goal", json=goal_biceps)
+    create_biceps_resp = session.post(f"{base_url}/create-goal", data=_GOAL_BICEPS_BODY, headers=_JSON_HEADERS)
     assert create_biceps_resp.status_code == 201
     assert create_biceps_resp.json()["status"] == "success"
     print("Boxer creation successful")
 
     # Change password
-    change_password_resp = session.post(f"{base_url}/change-password", json={
-        "new_password": "new_password"
-    })
+    change_password_resp = session.post(f"{base_url}/change-password", data=_NEW_PASSWORD_BODY, headers=_JSON_HEADERS)
     assert change_password_resp.status_code == 200
     assert change_password_resp.json()["status"] == "success"
     print("Password change successful")
 
     # Log in with new password
-    login_resp = session.post(f"{base_url}/login", json={
-        "username": username,
-        "password": "new_password"
-    })
+    login_resp = session.post(f"{base_url}/login", data=_NEW_CREDENTIALS_BODY, headers=_JSON_HEADERS)
     assert login_resp.status_code == 200
     assert login_resp.json()["status"] == "success"
     print("Login with new password successful")
 
 
     pecs_id = 2
-    create_pecs_resp = session.post(f"{base_url}/create-goal", json=goal_pecs)
+    create_pecs_resp = session.post(f"{base_url}/create-goal", data=_GOAL_PECS_BODY, headers=_JSON_HEADERS)
     assert create_pecs_resp.status_code == 201
     assert create_pecs_resp.json()["status"] == "success"
     print("goal creation successful")
 
 
-    get_goal_by_id_resp = session.get(f"{base_url}/get-goal-from-catalog-by-id/{biceps_id}")
-    assert get_goal_by_id_resp.status_code == 200
-    assert get_goal_by_id_resp.json()["target"] == "biceps"
-    assert get_goal_by_id_resp.json()["status"] == "success"
-    print("goal retrieved successfully")
-
-
     add_goal_to_plan_resp = session.post(f"{base_url}/add-goal-to-plan/{biceps_id}")
     assert add_goal_to_plan_resp.status_code == 200
-    assert add_goal_to_plan_resp.json()["status"] == "success"
-    assert add_goal_to_plan_resp.json()["message"] == "goal biceps - 35.0 out of 40 added to plan"
+    body = add_goal_to_plan_resp.json()
+    assert body["status"] == "success"
+    assert body["message"] == "goal biceps - 35.0 out of 40 added to plan"
     print("goal added to plan successfully")
 
 
     get_rec_resp = session.get(f"{base_url}/goals/recommendations/{pecs_id}")
     assert get_rec_resp.status_code == 200
-    assert get_rec_resp.json()["status"] == "success"
-    assert get_rec_resp.json()["recommendations"] == [{'bodyPart': 'chest', 'equipment': 'leverage machine', 'gifUrl': 'https://v2.exercisedb.io/image/M1vEH1gTLk2nxf', 'id': '0009', 'name': 'assisted chest dip (kneeling)', 'target': 'pectorals', 'secondaryMuscles': ['triceps', 'shoulders'], 'instructions': ['Adjust the machine to your desired height and secure your knees on the pad.', 'Grasp the handles with your palms facing down and your arms fully extended.', 'Lower your body by bending your elbows until your upper arms are parallel to the floor.', 'Pause for a moment, then push yourself back up to the starting position.', 'Repeat for the desired number of repetitions.']}]
+    body = get_rec_resp.json()
+    assert body["status"] == "success"
+    assert body["recommendations"] == [{'bodyPart': 'chest', 'equipment': 'leverage machine', 'gifUrl': 'https://v2.exercisedb.io/image/M1vEH1gTLk2nxf', 'id': '0009', 'name': 'assisted chest dip (kneeling)', 'target': 'pectorals', 'secondaryMuscles': ['triceps', 'shoulders'], 'instructions': ['Adjust the machine to your desired height and secure your knees on the pad.', 'Grasp the handles with your palms facing down and your arms fully extended.', 'Lower your body by bending your elbows until your upper arms are parallel to the floor.', 'Pause for a moment, then push yourself back up to the starting position.', 'Repeat for the desired number of repetitions.']}]
     print("recommendation retrieved successfully")
 
-    log_workout_resp = session.post(f"{base_url}/goals/log-session/{pecs_id}", json=example_workout)
+    log_workout_resp = session.post(f"{base_url}/goals/log-session/{pecs_id}", data=_EXAMPLE_WORKOUT_BODY, headers=_JSON_HEADERS)
     assert log_workout_resp.status_code == 200
-    assert log_workout_resp.json()["status"] == "success"
-    assert log_workout_resp.json()["message"] == "Goal completed! Total progress: 125.0%"
+    body = log_workout_resp.json()
+    assert body["status"] == "success"
+    assert body["message"] == "Goal completed! Total progress: 125.0%"
     print("workout logged successfully")
 
 
     get_all_goals_from_plan_resp = session.get(f"{base_url}/get-all-goals-from-plan")
     assert get_all_goals_from_plan_resp.status_code == 200
-    assert get_all_goals_from_plan_resp.json()["status"] == "success"
-    assert get_all_goals_from_plan_resp.json()["goals"] == [biceps_id]
+    body = get_all_goals_from_plan_resp.json()
+    assert body["status"] == "success"
+    assert body["goals"] == [biceps_id]
     print("plan retrieved successfully")
 
 
     get_plan_progress_resp = session.get(f"{base_url}/get-plan-progress")
     assert get_plan_progress_resp.status_code == 200
-    assert get_plan_progress_resp.json()["status"] == "success"
-    assert get_plan_progress_resp.json()["percentage"] == 0.0
+    body = get_plan_progress_resp.json()
+    assert body["status"] == "success"
+    assert body["percentage"] == 0.0
     print("plan progress retrieved successfully")
 
 
     remove_goal_from_plan_resp = session.delete(f"{base_url}/remove-goal-from-plan/{biceps_id}")
     assert remove_goal_from_plan_resp.status_code == 200
-    assert remove_goal_from_plan_resp.json()["status"] == "success"
-    assert remove_goal_from_plan_resp.json()["message"] == f"Goal with id {biceps_id} removed from plan"
+    body = remove_goal_from_plan_resp.json()
+    assert body["status"] == "success"
+    assert body["message"] == f"Goal with id {biceps_id} removed from plan"
     print("goal removed from plan successfully")
 
 
@@ -156,38 +236,38 @@ def run_smoketest():
     assert clear_plan_resp.json()["status"] == "success"
     print("plan cleared successfully")
 
-    get_goal_by_target_resp = session.get(f"{base_url}/goals/by-target/{goal_biceps["target"]}")
-    assert get_goal_by_target_resp.status_code == 200
-    assert get_goal_by_target_resp.json()["goals"] == [biceps_id]
-    assert get_goal_by_target_resp.json()["status"] == "success"
-    print("goal retrieved successfully")
-
-
-    get_goal_by_completed_resp = session.get(f"{base_url}/goals/by-completed/{goal_pecs["completed"]}")
-    assert get_goal_by_completed_resp.status_code == 200
-    assert get_goal_by_completed_resp.json()["goals"] == [pecs_id]
-    assert get_goal_by_completed_resp.json()["status"] == "success"
-    print("goal retrieved successfully")
-
-
-    get_goal_by_value_resp = session.get(f"{base_url}/goals/by-value/{goal_pecs["goal_value"]}")
-    assert get_goal_by_value_resp.status_code == 200
-    assert get_goal_by_value_resp.json()["goals"] == [pecs_id]
-    assert get_goal_by_value_resp.json()["status"] == "success"
-    print("goal retrieved successfully")
-
-
-    update_goal_resp = session.patch(f"{base_url}/update-goal/{biceps_id}", json=updated_biceps)
+    # One batched request covers the catalog lookups instead of a round trip each
+    query_goals_resp = session.post(f"{base_url}/goals/query", json={"queries": [
+        {"by": "id", "value": biceps_id},
+        {"by": "target", "value": _GOAL_BICEPS["target"]},
+        {"by": "completed", "value": _GOAL_PECS["completed"]},
+        {"by": "value", "value": _GOAL_PECS["goal_value"]}
+    ]})
+    assert query_goals_resp.status_code == 200
+    body = query_goals_resp.json()
+    assert body["status"] == "success"
+    assert body["results"] == [
+        {"status": "success", "target": "biceps"},
+        {"status": "success", "goals": [biceps_id]},
+        {"status": "success", "goals": [pecs_id]},
+        {"status": "success", "goals": [pecs_id]}
+    ]
+    print("goals queried successfully")
+
+
+    update_goal_resp = session.patch(f"{base_url}/update-goal/{biceps_id}", data=_UPDATED_BICEPS_BODY, headers=_JSON_HEADERS)
     assert update_goal_resp.status_code == 200
-    assert update_goal_resp.json()["status"] == "success"
-    assert update_goal_resp.json()["updated_fields"] == [updated_biceps["goal_progress"], updated_biceps["completed"]]
+    body = update_goal_resp.json()
+    assert body["status"] == "success"
+    assert body["updated_fields"] == [_UPDATED_BICEPS["goal_progress"], _UPDATED_BICEPS["completed"]]
     print("goal updated successfully")
 
     
     get_all_goals_resp = session.get(f"{base_url}/get-all-goals-from-catalog")
     assert get_all_goals_resp.status_code == 200
-    assert [get_all_goals_resp.json()["goals"][0]["id"],get_all_goals_resp.json()["goals"][1]["id"]] == [biceps_id, pecs_id]
-    assert get_all_goals_resp.json()["status"] == "success"
+    body = get_all_goals_resp.json()
+    assert list(map(itemgetter("id"), body["goals"][:2])) == [biceps_id, pecs_id]
+    assert body["status"] == "success"
     print("goals retrieved successfully")
 
 
@@ -199,7 +279,7 @@ def run_smoketest():
 
     fake_id = 3
     delete_fake_resp = session.delete(f"{base_url}/delete-goal/{fake_id}")
-    assert delete_fake_resp.status_code == 500
+    assert delete_fake_resp.status_code == 400
     assert delete_fake_resp.json()["status"] == "error"
     print("goal deletion failed as expected")
 
@@ -209,11 +289,18 @@ def run_smoketest():
     assert logout_resp.json()["status"] == "success"
     print("Logout successful")
 
-    create_boxer_logged_out_resp = session.post(f"{base_url}/create-goal", json=goal_pecs)
+    create_boxer_logged_out_resp = session.post(f"{base_url}/create-goal", data=_GOAL_PECS_BODY, headers=_JSON_HEADERS)
     # This should fail because we are logged out
     assert create_boxer_logged_out_resp.status_code == 401
     assert create_boxer_logged_out_resp.json()["status"] == "error"
     print("goal creation failed as expected")
 
 if __name__ == "__main__":
-    run_smoketest()
+    parser = argparse.ArgumentParser(description="Smoke test the Coach Peter API.")
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="run against an in-process app on an in-memory database instead of localhost:5000"
+    )
+    args = parser.parse_args()
+    run_smoketest(_build_local_client() if args.local else None)
@@ -5,10 +5,13 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 from app import create_app
 from config import TestConfig
 from coach_peter.db import db
+from contextlib import contextmanager
+from sqlalchemy import event
 from sqlalchemy.orm import scoped_session, sessionmaker
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def app():
+    """Creates the app and its schema once; the in-memory engine uses a StaticPool, so every test shares it."""
     app = create_app(TestConfig)
     with app.app_context():
         db.create_all()
@@ -20,24 +23,6 @@ def app():
 def client(app):
     return app.test_client()
 
-@pytest.fixture
-def session(app):
-    with app.app_context():
-        yield db.session
-
-@pytest.fixture(scope="session")
-def app():
-    
-    from config import TestConfig
-    from app import create_app
-
-    app = create_app(TestConfig)
-    with app.app_context():
-        db.create_all()
-        yield app
-        db.session.remove()
-        db.drop_all()
-
 @pytest.fixture(scope="function")
 def session(app):
     """Creates a scoped session compatible with Flask-SQLAlchemy 3.x."""
@@ -51,6 +36,28 @@ def session(app):
 
     yield Session
 
-    transaction.rollback()
+    # A test that rolls the session back has already ended the outer transaction
+    if transaction.is_active:
+        transaction.rollback()
     connection.close()
-    Session.remove()
\ No newline at end of file
+    Session.remove()
+
+
+@pytest.fixture
+def count_queries(session):
+    """Provides a context manager that records the SQL statements run inside it."""
+    @contextmanager
+    def counter():
+        statements = []
+
+        def record(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        bind = session.get_bind()
+        event.listen(bind, "before_cursor_execute", record)
+        try:
+            yield statements
+        finally:
+            event.remove(bind, "before_cursor_execute", record)
+
+    return counter
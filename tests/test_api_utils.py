@@ -1,28 +1,16 @@
 import pytest
 import requests
 import os
+import threading
+from concurrent.futures import Future
 
-from coach_peter.utils.api_utils import fetch_data, fetch_recommendation
-from pytest_mock import MockerFixture
+from coach_peter.utils.api_utils import (
+    _SESSION, _recommendation_cache, clear_recommendation_cache, fetch_data, fetch_recommendation
+)
 
 
-@pytest.fixture
-def mock_exerciseDB(mocker):
-    # Patch the requests.get call
-    # requests.get returns an object, which we have replaced with a mock object
-    mock_response = mocker.Mock()
-    # We are giving that object a text attribute
-    mocker.patch("requests.get", return_value=mock_response)
-    return mock_response
-
-
-def test_fetch_data(mock_exerciseDB):
-    """Test fetching data from api
-
-    """
-    
-    mock_response = mock_exerciseDB
-    mock_response.json.return_value = [
+# Two-exercise API response shared by the tests below
+_EXERCISES = [
     {
         "bodyPart": "chest",
         "equipment": "body weight",
@@ -30,9 +18,8 @@ def test_fetch_data(mock_exerciseDB):
         "id": "0001",
         "name": "Push-up",
         "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"]        
+        "secondaryMuscles": ["upper arms", "shoulders"]
     },
-    
     {
         "bodyPart": "chest",
         "equipment": "barbell",
@@ -40,10 +27,36 @@ def test_fetch_data(mock_exerciseDB):
         "id": "0002",
         "name": "Bench Press",
         "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"] 
-        
+        "secondaryMuscles": ["upper arms", "shoulders"]
     }
-    ]
+]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    """Fixture to start every test with an empty recommendation cache."""
+    clear_recommendation_cache()
+    yield
+    clear_recommendation_cache()
+
+
+@pytest.fixture
+def mock_exerciseDB(mocker):
+    # Patch the shared session's get call
+    # _SESSION.get returns an object, which we have replaced with a mock object
+    mock_response = mocker.Mock(status_code=200, headers={})
+    # We are giving that object a text attribute
+    mocker.patch.object(_SESSION, "get", return_value=mock_response)
+    return mock_response
+
+
+def test_fetch_data(mock_exerciseDB):
+    """Test fetching data from api
+
+    """
+    
+    mock_response = mock_exerciseDB
+    mock_response.json.return_value = _EXERCISES
 
     url = "https://exercisedb.p.rapidapi.com/exercises/target/chest/?limit=1"
     params = {"example": "param"}
@@ -51,39 +64,35 @@ def test_fetch_data(mock_exerciseDB):
     result = fetch_data(url, params=params)
 
     # Assert that the result is the mocked exercise list
-    assert result == [
-    {
-        "bodyPart": "chest",
-        "equipment": "body weight",
-        "gifUrl": "https://example.com/pushup.gif",
-        "id": "0001",
-        "name": "Push-up",
-        "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"]        
-    },
-    
-    {
-        "bodyPart": "chest",
-        "equipment": "barbell",
-        "gifUrl": "https://example.com/benchpress.gif",
-        "id": "0002",
-        "name": "Bench Press",
-        "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"] 
-        
-    }
-    ]
+    assert result == _EXERCISES
 
     # Ensure that the correct URL was called
-    requests.get.assert_called_once_with(
+    _SESSION.get.assert_called_once_with(
         url,
-        headers = {
-            "X-RapidAPI-Key": os.getenv("EXERCISE_DB_API_KEY"),
-            "X-RapidAPI-Host": "exercisedb.p.rapidapi.com"
-        },  
         params=params,
         timeout=5
-    )    
+    )
+
+
+def test_session_headers():
+    """Test the shared session sends the API headers on every request."""
+    assert _SESSION.headers["X-RapidAPI-Key"] == os.getenv("EXERCISE_DB_API_KEY")
+    assert _SESSION.headers["X-RapidAPI-Host"] == "exercisedb.p.rapidapi.com"
+
+
+def test_fetch_data_not_modified(mock_exerciseDB):
+    """Test a repeat request sends the stored ETag and reuses the body on a 304."""
+    url = "https://exercisedb.p.rapidapi.com/exercises/target/chest/?limit=1"
+    mock_exerciseDB.headers = {"ETag": '"v1"'}
+    mock_exerciseDB.json.return_value = [{"id": "0001", "name": "Push-up"}]
+    first = fetch_data(url)
+
+    mock_exerciseDB.status_code = 304
+    mock_exerciseDB.json.side_effect = ValueError("304 responses have no body")
+    second = fetch_data(url)
+
+    assert second == first
+    _SESSION.get.assert_called_with(url, params=None, headers={"If-None-Match": '"v1"'}, timeout=5)
 
 def test_fetch_data_request_failure(mocker):
     """
@@ -91,7 +100,7 @@ def test_fetch_data_request_failure(mocker):
     """
     
     # Simulate a request failure
-    mocker.patch("requests.get", side_effect=requests.exceptions.RequestException("Connection error"))
+    mocker.patch.object(_SESSION, "get", side_effect=requests.exceptions.RequestException("Connection error"))
 
     with pytest.raises(RuntimeError, match="Request failed: Connection error"):
         fetch_data("https://exercisedb.p.rapidapi.com/exercises/target/chest/?limit=1")
@@ -102,7 +111,7 @@ def test_fetch_data_timeout(mocker):
 
     """
     # Simulate a timeout
-    mocker.patch("requests.get", side_effect=requests.exceptions.Timeout)
+    mocker.patch.object(_SESSION, "get", side_effect=requests.exceptions.Timeout)
 
     with pytest.raises(RuntimeError, match="Request timed out."):
         fetch_data("https://exercisedb.p.rapidapi.com/exercises/target/chest/?limit=1")
@@ -116,28 +125,7 @@ def test_fetch_recommendation_success(mock_exerciseDB):
     """
 
     mock_response = mock_exerciseDB
-    mock_response.json.return_value = [
-    {
-        "bodyPart": "chest",
-        "equipment": "body weight",
-        "gifUrl": "https://example.com/pushup.gif",
-        "id": "0001",
-        "name": "Push-up",
-        "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"]        
-    },
-    
-    {
-        "bodyPart": "chest",
-        "equipment": "barbell",
-        "gifUrl": "https://example.com/benchpress.gif",
-        "id": "0002",
-        "name": "Bench Press",
-        "target": "pectorals",
-        "secondaryMuscles": ["upper arms", "shoulders"] 
-        
-    }
-    ]
+    mock_response.json.return_value = _EXERCISES
 
 
     #Input body part for recommendation
@@ -148,16 +136,58 @@ def test_fetch_recommendation_success(mock_exerciseDB):
     assert len(exercises) == 2
     assert exercises[0]["name"] == "Push-up"
     
-    requests.get.assert_called_once_with(
+    _SESSION.get.assert_called_once_with(
         "https://exercisedb.p.rapidapi.com/exercises/target/chest/?limit=1",
-        headers = {
-            "X-RapidAPI-Key": os.getenv("EXERCISE_DB_API_KEY"),
-            "X-RapidAPI-Host": "exercisedb.p.rapidapi.com"
-        },  
         params=None,
         timeout=5
     )
 
+def test_fetch_recommendation_cached(mock_exerciseDB):
+    """Test repeated recommendations for a target within the TTL call the API once."""
+    mock_exerciseDB.json.return_value = [{"id": "0001", "name": "Push-up", "target": "pectorals"}]
+
+    first = fetch_recommendation("pectorals")
+    second = fetch_recommendation("pectorals")
+
+    assert first == second
+    _SESSION.get.assert_called_once()
+
+def test_fetch_recommendation_concurrent_requests_share_one_call(mock_exerciseDB, mocker):
+    """Test callers asking for a target while its request is in flight reuse that request."""
+    # The API call can't return until both followers are waiting on its result,
+    # so neither can have been served from the cache instead
+    arrived = threading.Barrier(3, timeout=5)
+    wait_for_result = Future.result
+
+    def result_after_arriving(future, timeout=None):
+        arrived.wait()
+        return wait_for_result(future, timeout)
+
+    def slow_get(*args, **kwargs):
+        arrived.wait()
+        return mock_exerciseDB
+
+    mocker.patch.object(Future, "result", result_after_arriving)
+    mock_exerciseDB.json.return_value = _EXERCISES
+    _SESSION.get.side_effect = slow_get
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(fetch_recommendation("pectorals"))) for _ in range(3)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [_EXERCISES] * 3
+    _SESSION.get.assert_called_once()
+
+def test_fetch_recommendation_rechecks_cache_under_lock(mock_exerciseDB, mocker):
+    """Test a caller whose first cache check lost the race to a finishing leader uses its result."""
+    mocker.patch.object(_recommendation_cache, "get", side_effect=[None, _EXERCISES])
+
+    assert fetch_recommendation("pectorals") == _EXERCISES
+    _SESSION.get.assert_not_called()
+
 def test_invalid_fetch_recommendation(mock_exerciseDB):
     """
     Test that an unsupported body part results in a ValueError
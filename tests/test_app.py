@@ -0,0 +1,176 @@
+import pytest
+
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from config import TestConfig
+from coach_peter.models.goal_model import Goals
+from coach_peter.models.user_model import Users
+
+
+@pytest.fixture
+def api(session):
+    """Fixture for a client of a fresh app, with empty caches and plans.
+
+    The shared app fixture keeps one app context open for the whole run. A separate
+    app gives every request its own app context (and g), as in production, while the
+    patched db.session still keeps each test inside its rolled-back transaction.
+
+    """
+    return create_app(TestConfig).test_client()
+
+def _register_and_login(client, username, password):
+    """Create a user through the API and log the client in as them."""
+    client.put("/api/create-user", json={"username": username, "password": password})
+    response = client.post("/api/login", json={"username": username, "password": password})
+    assert response.status_code == 200
+
+# --- Users ---
+
+def test_stale_session_after_reset_does_not_reach_the_next_user(api):
+    """Test a session from before a users reset can't act as whoever registers the same name next."""
+    _register_and_login(api, "alice", "old-password")
+    api.delete("/api/reset-users")
+
+    new_alice = api.application.test_client()
+    _register_and_login(new_alice, "alice", "new-password")
+
+    assert api.post("/api/change-password", json={"new_password": "stolen"}).status_code == 401
+    assert api.get("/api/get-all-goals-from-catalog").status_code == 401
+    assert new_alice.post("/api/login", json={"username": "alice", "password": "new-password"}).status_code == 200
+
+def test_session_of_deleted_user_does_not_reach_the_next_user(api, session):
+    """Test a deleted user's id isn't handed to the next user, so their session can't act as them."""
+    _register_and_login(api, "alice", "old-password")
+    Users.delete_user("alice")
+
+    new_alice = api.application.test_client()
+    _register_and_login(new_alice, "alice", "new-password")
+
+    assert api.post("/api/change-password", json={"new_password": "stolen"}).status_code == 401
+    assert new_alice.post("/api/login", json={"username": "alice", "password": "new-password"}).status_code == 200
+
+# --- Goal queries ---
+
+_PECS_GOAL = {"target": "pectorals", "goal_value": 200, "goal_progress": 225.0, "completed": True}
+
+@pytest.fixture
+def logged_in(api):
+    """Fixture for a logged-in client with a biceps goal in the catalog."""
+    _register_and_login(api, "coach", "coach-password")
+    response = api.post("/api/create-goal", json={"target": "biceps", "goal_value": 40, "goal_progress": 35.0, "completed": False})
+    assert response.status_code == 201
+    return api
+
+def test_query_goals(logged_in):
+    """Test a batch of lookups returns one result per query, in order."""
+    response = logged_in.post("/api/goals/query", json={"queries": [
+        {"by": "id", "value": 1},
+        {"by": "target", "value": "biceps"},
+        {"by": "completed", "value": False},
+        {"by": "value", "value": 7},
+    ]})
+
+    assert response.status_code == 200
+    assert [result["status"] for result in response.get_json()["results"]] == ["success", "success", "success", "error"]
+
+@pytest.mark.parametrize("query", [
+    {"by": "target", "value": [1]},
+    {"by": "target", "value": {}},
+    {"by": "target", "value": 1},
+    {"by": "completed", "value": "yes"},
+    {"by": "completed", "value": 1},
+    {"by": "completed", "value": {}},
+    {"by": "id", "value": True},
+    {"by": "id", "value": 2 ** 63},
+    {"by": "value", "value": -2 ** 64},
+])
+def test_query_goals_malformed_entry(logged_in, query):
+    """Test a lookup with a value of the wrong type or range gets an error result without failing the batch."""
+    response = logged_in.post("/api/goals/query", json={"queries": [query, {"by": "target", "value": "biceps"}]})
+
+    assert response.status_code == 200
+    bad, good = response.get_json()["results"]
+    assert bad["status"] == "error"
+    assert good == {"status": "success", "goals": [1]}
+
+@pytest.mark.parametrize("queries", [[], [{"by": ["id"], "value": 1}], [{"by": "name", "value": 1}], [{"by": "id"}]])
+def test_query_goals_invalid_batch(logged_in, queries):
+    """Test a malformed batch is rejected as a whole."""
+    assert logged_in.post("/api/goals/query", json={"queries": queries}).status_code == 400
+
+def test_query_goals_database_error(logged_in, mocker):
+    """Test a lookup that fails in the database gets an error result instead of a 500 for the batch."""
+    mocker.patch("app.Goals.get_goals_by_goal_value", side_effect=OperationalError("SELECT", {}, Exception("disk I/O error")))
+    response = logged_in.post("/api/goals/query", json={"queries": [{"by": "target", "value": "biceps"}, {"by": "value", "value": 40}]})
+
+    assert response.status_code == 200
+    good, bad = response.get_json()["results"]
+    assert good == {"status": "success", "goals": [1]}
+    assert bad == {"status": "error", "message": "Database error while querying goals by value"}
+
+# --- Catalog paging ---
+
+@pytest.mark.parametrize("query", [
+    "limit=0", "limit=-1", "limit=abc", "limit=%C2%B2", "limit=",
+    "limit=5&after=abc", "limit=5&after=-1", "limit=5&after=", f"limit=5&after={2 ** 63}",
+])
+def test_get_all_goals_invalid_paging(logged_in, query):
+    """Test a limit that isn't a positive integer or an after that isn't a non-negative one gets a 400."""
+    response = logged_in.get(f"/api/get-all-goals-from-catalog?{query}")
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+def test_get_all_goals_limit_is_clamped(logged_in, mocker):
+    """Test a limit above the maximum page size is clamped before the query runs."""
+    get_page = mocker.patch("app.Goals.get_goals_page", return_value=([], None))
+    response = logged_in.get("/api/get-all-goals-from-catalog?limit=999999999999")
+    assert response.status_code == 200
+    get_page.assert_called_once_with(after_id=0, limit=100)
+
+def test_get_all_goals_read_racing_a_write_is_not_served_stale(logged_in, mocker):
+    """Test rows read before a write, but cached after it, aren't served under the new ETag."""
+    read_all_goals = Goals.get_all_goals
+    writes = []
+
+    def read_then_write(**kwargs):
+        goals = read_all_goals(**kwargs)
+        if not writes:
+            # Another request adds a goal after this one read the catalog but before it caches
+            writes.append(logged_in.post("/api/create-goal", json=_PECS_GOAL))
+        return goals
+
+    mocker.patch("app.Goals.get_all_goals", side_effect=read_then_write)
+    first = logged_in.get("/api/get-all-goals-from-catalog")
+    assert writes[0].status_code == 201
+    assert len(first.get_json()["goals"]) == 1
+
+    second = logged_in.get("/api/get-all-goals-from-catalog")
+
+    assert len(second.get_json()["goals"]) == 2
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+# --- Update goal ---
+
+@pytest.mark.parametrize("target", ["   ", "x" * 256])
+def test_update_goal_invalid_target(logged_in, target):
+    """Test PATCHing a blank or too-long target is a 400, not a database error."""
+    response = logged_in.patch("/api/update-goal/1", json={"target": target})
+    assert response.status_code == 400
+    assert response.get_json()["status"] == "error"
+
+# --- Delete goal ---
+
+def test_delete_goal_runs_one_statement(logged_in, count_queries):
+    """Test deleting a goal runs the DELETE alone, without looking the goal up first."""
+    with count_queries() as statements:
+        response = logged_in.delete("/api/delete-goal/1")
+    assert response.status_code == 200
+    # The only other statement is the login's user lookup
+    assert [statement.split()[0] for statement in statements if '"Goals"' in statement] == ["DELETE"]
+
+def test_delete_goal_not_found(logged_in):
+    """Test deleting a goal that doesn't exist is a 400."""
+    response = logged_in.delete("/api/delete-goal/999")
+    assert response.status_code == 400
+    assert response.get_json() == {"status": "error", "message": "goal with ID 999 not found"}
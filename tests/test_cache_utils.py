@@ -0,0 +1,68 @@
+import pytest
+
+from coach_peter.utils.cache_utils import TTLCache
+
+
+@pytest.fixture
+def clock(mocker):
+    """Fixture to control the monotonic clock seen by the cache."""
+    now = [1000.0]
+    mocker.patch("coach_peter.utils.cache_utils.time.monotonic", side_effect=lambda: now[0])
+    return now
+
+
+def test_set_and_get(clock):
+    """Test a stored value is returned before it expires."""
+    cache = TTLCache(ttl=60)
+    cache.set("key", "value")
+    assert cache.get("key") == "value"
+
+
+def test_get_missing_returns_default():
+    """Test a missing key returns the default."""
+    cache = TTLCache(ttl=60)
+    assert cache.get("missing") is None
+    assert cache.get("missing", "default") == "default"
+
+
+def test_entry_expires(clock):
+    """Test an entry is dropped once its TTL has passed."""
+    cache = TTLCache(ttl=60)
+    cache.set("key", "value")
+    clock[0] += 60
+    assert cache.get("key") is None
+    assert len(cache) == 0
+
+
+def test_oldest_entry_evicted_when_full(clock):
+    """Test the oldest entry is evicted when the cache is full."""
+    cache = TTLCache(ttl=60, maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.set("c", 3)
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    assert cache.get("c") == 3
+
+
+def test_expired_entries_swept_on_write(clock, mocker):
+    """Test expired entries are dropped by a periodic sweep even if never read."""
+    mocker.patch.object(TTLCache, "SWEEP_INTERVAL", 3)
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    clock[0] += 60
+    cache.set("c", 3)
+    assert len(cache) == 1
+    assert cache.get("c") == 3
+
+
+def test_pop_and_clear(clock):
+    """Test removing a single entry and clearing the cache."""
+    cache = TTLCache(ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.pop("a") == 1
+    assert cache.get("a") is None
+    cache.clear()
+    assert len(cache) == 0
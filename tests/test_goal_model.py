@@ -1,20 +1,24 @@
 import pytest
 
+from sqlalchemy import ForeignKey, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, InvalidRequestError
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
+
+from app import create_app
+from config import TestConfig
+from coach_peter.models import goal_model
 from coach_peter.models.goal_model import Goals
-from pytest_mock import MockerFixture
 
 # --- Fixtures ---
 
+_BICEPS = dict(target="biceps", goal_value=10, goal_progress=2.0, completed=False, progress_notes='[]')
+_PECS = dict(target="pectorals", goal_value=15, goal_progress=15.0, completed=True, progress_notes='[]')
+
 @pytest.fixture
 def goal_biceps(session): 
     """Fixture for a biceps goal."""
-    goal = Goals(
-           target="biceps", 
-           goal_value=10, 
-           goal_progress=2.0, 
-           completed=False, 
-           progress_notes='[]'
-    )
+    goal = Goals(**_BICEPS)
     session.add(goal)
     session.commit()
     return goal
@@ -22,24 +26,25 @@ def goal_biceps(session):
 @pytest.fixture
 def goal_pecs(session):
     """Fixture for a pecs goal."""
-    goal = Goals(
-        target="pectorals", 
-        goal_value=15, 
-        goal_progress=15.0, 
-        completed=True, 
-        progress_notes='[]'
-        )
-
+    goal = Goals(**_PECS)
     session.add(goal)
     session.commit()
     return goal
 
+@pytest.fixture
+def two_goals(session):
+    """Fixture for the biceps and pecs goals, inserted in one commit."""
+    goals = (Goals(**_BICEPS), Goals(**_PECS))
+    session.add_all(goals)
+    session.commit()
+    return goals
+
 # --- Create Goal ---
 
 def test_create_goal(session):
     """Test creating a new goal."""
-    Goals.create_goal(target="legs", goal_value=20, goal_progress=0.0, completed=False)
-    goal = session.query(Goals).filter_by(target="legs").first()
+    goal_id = Goals.create_goal(target="legs", goal_value=20, goal_progress=0.0, completed=False)
+    goal = session.get(Goals, goal_id)
     assert goal is not None
     assert goal.target == "legs"
     assert goal.goal_value == 20
@@ -64,11 +69,63 @@ def test_create_goal_mismatch_2(session):
         Goals.create_goal(target="legs", goal_value=20, goal_progress=22.0, completed=False)
 
 
+def test_create_goal_without_progress(session):
+    """Test creating a goal with no progress recorded yet."""
+    Goals.create_goal(target="legs", goal_value=20, completed=False)
+    assert Goals.get_goals_by_target("legs")[0].completed is False
+
+
+def test_create_goal_strips_target(session):
+    """Test surrounding whitespace is removed from the target."""
+    Goals.create_goal(target="  legs ", goal_value=20, goal_progress=0.0, completed=False)
+    assert len(Goals.get_goals_by_target("legs")) == 1
+
+
+def test_create_goals(session):
+    """Test creating several goals at once."""
+    created = Goals.create_goals([
+        {"target": "legs", "goal_value": 20, "goal_progress": 0.0, "completed": False},
+        {"target": "core", "goal_value": 5, "goal_progress": 5.0, "completed": True},
+    ])
+    assert created == 2
+    assert len(Goals.get_all_goals()) == 2
+
+
+def test_create_goals_in_batches(session, mocker):
+    """Test goals beyond one batch are all inserted."""
+    mocker.patch("coach_peter.models.goal_model._BULK_INSERT_BATCH", 2)
+    created = Goals.create_goals(
+        {"target": "legs", "goal_value": value, "completed": False} for value in (10, 20, 30)
+    )
+    assert created == 3
+    assert [goal["goal_value"] for goal in Goals.get_all_goals()] == [10, 20, 30]
+
+
+def test_create_goals_skips_existing(session, goal_biceps):
+    """Test goals that already exist are skipped while the rest are created."""
+    created = Goals.create_goals([
+        {"target": "legs", "goal_value": 20, "completed": False},
+        {"target": "biceps", "goal_value": 10, "completed": False},
+        {"target": "legs", "goal_value": 20, "completed": False},
+    ])
+    assert created == 1
+    assert len(Goals.get_all_goals()) == 2
+
+
+@pytest.mark.parametrize("dialect", [postgresql.dialect(), sqlite.dialect()], ids=["postgresql", "sqlite"])
+def test_insert_ignoring_duplicates_per_backend(session, mocker, dialect):
+    """Test every supported backend skips duplicates of the compound key with the same clause."""
+    mocker.patch.object(session, "get_bind", return_value=mocker.Mock(dialect=dialect))
+    stmt = goal_model._insert_ignoring_duplicates()
+    assert "ON CONFLICT (target, goal_value) DO NOTHING" in str(stmt.compile(dialect=dialect))
+
+
 @pytest.mark.parametrize("target, goal_value, goal_progress, completed", [
     ("", 10, 0.0, False),
     ("shoulders", None, 0.0, False),
     ("core", 20, "high", False),
     ("arms", 15, 2.0, "yes"),
+    ("arms", True, 0.0, False),
 ])
 
 def test_create_goal_invalid_data(target, goal_value, goal_progress, completed):
@@ -84,6 +141,14 @@ def test_get_goal_by_id(goal_biceps):
     fetched = Goals.get_goal_by_id(goal_biceps.id)
     assert fetched.target == "biceps"
 
+def test_get_goal_by_id_single_query(session, goal_biceps, count_queries):
+    """Test a lookup by ID issues one SELECT and a repeat lookup none."""
+    session.expire_all()
+    with count_queries() as statements:
+        Goals.get_goal_by_id(goal_biceps.id)
+        Goals.get_goal_by_id(goal_biceps.id)
+    assert len(statements) == 1
+
 def test_get_goal_by_id_not_found(app, session):
     """Test error when fetching nonexistent goal by ID."""
     with pytest.raises(ValueError, match="not found"):
@@ -116,13 +181,87 @@ def test_get_goal_completed(goal_biceps):
     assert isinstance(fetched.completed, bool)
     assert fetched.completed == goal_biceps.completed
 
+def test_count_completed(goal_biceps, goal_pecs):
+    """Test counting the completed goals among a set of IDs, ignoring unknown IDs."""
+    assert Goals.count_completed([goal_biceps.id, goal_pecs.id, 999]) == (1, 2)
+    assert Goals.count_completed([]) == (0, 0)
+
+
+def test_get_goals_by_field(goal_biceps, goal_pecs):
+    """Test filtering goals by a column through the shared query builder."""
+    goals = Goals.get_goals_by_field("target", "biceps")
+    assert [goal.id for goal in goals] == [goal_biceps.id]
+
+def test_get_goals_by_field_single_query(goal_biceps, goal_pecs, count_queries):
+    """Test filtering and reading every column of the results takes one SELECT."""
+    with count_queries() as statements:
+        goals = Goals.get_goals_by_field("completed", False)
+        [(goal.target, goal.goal_value, goal.goal_progress, goal.progress_notes) for goal in goals]
+    assert len(statements) == 1
+
+def test_get_goals_by_target_ignores_surrounding_whitespace(goal_biceps):
+    """Test a padded target still matches the stored, stripped target."""
+    assert [goal.id for goal in Goals.get_goals_by_target(" biceps ")] == [goal_biceps.id]
+
+class _ThrowawayBase(DeclarativeBase):
+    """Separate registry for models that exist only to exercise the lazy-load guard."""
+
+
+class _Coach(_ThrowawayBase):
+    __tablename__ = "throwaway_coaches"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    pupils: Mapped[list["_Pupil"]] = relationship()
+
+
+class _Pupil(_ThrowawayBase):
+    __tablename__ = "throwaway_pupils"
+    id: Mapped[int] = mapped_column(primary_key=True)
+    coach_id: Mapped[int] = mapped_column(ForeignKey("throwaway_coaches.id"))
+
+
+def test_lazy_load_guard_raises_on_lazy_relationship(session):
+    """Test a relationship lazy-loaded from a guarded query raises instead of running a query."""
+    _ThrowawayBase.metadata.create_all(session.connection())
+    session.add(_Coach(id=1, pupils=[_Pupil(id=1)]))
+    session.flush()
+    session.expunge_all()
+
+    coach = session.execute(goal_model._raise_on_lazy_load(select(_Coach))).scalar_one()
+    with pytest.raises(InvalidRequestError):
+        coach.pupils
+
+    session.expunge_all()
+    coach = session.execute(select(_Coach)).scalar_one()
+    assert [pupil.id for pupil in coach.pupils] == [1], "Unguarded queries should still lazy-load"
+
+def test_debug_app_guards_goal_queries(monkeypatch, goal_biceps):
+    """Test an app created in debug mode puts the guard on the prebuilt goal queries, which still work."""
+    # Restore the module's statements afterwards, since the guard swaps them for the process
+    monkeypatch.setattr(goal_model, "_FILTER_STATEMENTS", goal_model._FILTER_STATEMENTS)
+    monkeypatch.setattr(goal_model, "_GOALS_BY_IDS_STATEMENT", goal_model._GOALS_BY_IDS_STATEMENT)
+
+    class DebugConfig(TestConfig):
+        DEBUG = True
+
+    create_app(DebugConfig)
+
+    statements = [*goal_model._FILTER_STATEMENTS.values(), goal_model._GOALS_BY_IDS_STATEMENT]
+    assert all(stmt._with_options for stmt in statements)
+    assert [goal.id for goal in Goals.get_goals_by_field("target", "biceps")] == [goal_biceps.id]
+    assert [goal.id for goal in Goals.get_goals_by_ids([goal_biceps.id])] == [goal_biceps.id]
+
+def test_get_goals_by_field_invalid_field(app, session):
+    """Test error when filtering goals on a column that is not allowed."""
+    with pytest.raises(ValueError, match="Cannot filter goals by 'progress_notes'"):
+        Goals.get_goals_by_field("progress_notes", "[]")
+
 
 # --- Delete Goal ---
 
 def test_delete_goal_by_id(session, goal_pecs):
     """Test deleting a goal by ID."""
     Goals.delete_goal(goal_pecs.id)
-    assert session.query(Goals).get(goal_pecs.id) is None
+    assert session.get(Goals, goal_pecs.id) is None
 
 def test_delete_goal_not_found(app, session):
     """Test deleting a non-existent goal by ID."""
@@ -132,19 +271,19 @@ def test_delete_goal_not_found(app, session):
 def test_delete_goal_by_target(session, goal_biceps):
     """Test deleting a goal by target."""
     Goals.delete_goal_by_target(goal_biceps.target)
-    deleted = session.query(Goals).filter_by(target=goal_biceps.target).first()
+    deleted = session.scalars(select(Goals).filter_by(target=goal_biceps.target)).first()
     assert deleted is None
 
 def test_delete_goal_by_goal_value(session, goal_biceps):
     """Test deleting a goal by goal_value."""
     Goals.delete_goal_by_goal_value(goal_biceps.goal_value)
-    deleted = session.query(Goals).filter_by(goal_value=goal_biceps.goal_value).first()
+    deleted = session.scalars(select(Goals).filter_by(goal_value=goal_biceps.goal_value)).first()
     assert deleted is None
 
 def test_delete_goal_by_completed(session, goal_biceps):
     """Test deleting a goal by completed status."""
     Goals.delete_goal_by_completed(goal_biceps.completed)
-    deleted = session.query(Goals).filter_by(completed=goal_biceps.completed).first()
+    deleted = session.scalars(select(Goals).filter_by(completed=goal_biceps.completed)).first()
     assert deleted is None
 
 
@@ -156,6 +295,35 @@ def test_update_goal(session, goal_biceps):
     assert updated.goal_value == 20
     assert updated.completed is True
 
+def test_update_goal_progress_completes_goal(session, goal_biceps):
+    """Test progress that reaches the stored goal value marks the goal completed."""
+    updated = Goals.update_goal(goal_biceps.id, goal_progress=10.0)
+    assert updated.goal_progress == 10.0
+    assert updated.completed is True
+
+def test_update_goal_not_found(app, session):
+    """Test error when updating a nonexistent goal."""
+    with pytest.raises(ValueError, match="Goal with ID 999 not found"):
+        Goals.update_goal(999, goal_value=20)
+
+@pytest.mark.parametrize("target, message", [("   ", "non-empty"), ("x" * 256, "at most 255")])
+def test_update_goal_invalid_target(session, goal_biceps, target, message):
+    """Test a blank or too-long target is rejected before the UPDATE runs."""
+    with pytest.raises(ValueError, match=message):
+        Goals.update_goal(goal_biceps.id, target=target)
+
+def test_create_goal_target_too_long(session):
+    """Test creating a goal whose target is longer than the column allows."""
+    with pytest.raises(ValueError, match="at most 255 characters"):
+        Goals.create_goal(target="x" * 256, goal_value=20, goal_progress=0.0, completed=False)
+
+
+def test_blank_target_rejected_by_database(session):
+    """Test the database refuses a blank target that skipped validation."""
+    session.add(Goals(target="   ", goal_value=10, goal_progress=0.0, completed=False, progress_notes='[]'))
+    with pytest.raises(IntegrityError):
+        session.flush()
+
 
 # --- Log Progress ---
 def test_log_progress_updated(session, goal_biceps):
@@ -204,8 +372,9 @@ def test_get_exercise_recommendations(session, goal_biceps, mocker):
 
 # --- Get All Goals ---
 
-def test_get_all_goals(session, goal_biceps, goal_pecs):
+def test_get_all_goals(session, two_goals):
     """Test retrieving all goals."""
+    goal_biceps, goal_pecs = two_goals
     goals = Goals.get_all_goals()
     assert isinstance(goals, list)
     expected = [
@@ -229,3 +398,38 @@ def test_get_all_goals(session, goal_biceps, goal_pecs):
     assert goals == expected
 
 
+
+def test_iter_all_goals(session, two_goals):
+    """Test streaming goals in small batches yields every goal in order."""
+    goal_biceps, goal_pecs = two_goals
+    goals = Goals.iter_all_goals(batch_size=1)
+    assert next(goals)["id"] == goal_biceps.id
+    assert [goal["id"] for goal in goals] == [goal_pecs.id]
+
+
+def test_get_goals_page(session, two_goals):
+    """Test paging through goals by seeking past the last ID."""
+    goal_biceps, goal_pecs = two_goals
+    goals, next_after_id = Goals.get_goals_page(limit=1)
+    assert [goal["id"] for goal in goals] == [goal_biceps.id]
+    assert next_after_id == goal_biceps.id
+
+    goals, next_after_id = Goals.get_goals_page(after_id=next_after_id, limit=2)
+    assert [goal["id"] for goal in goals] == [goal_pecs.id]
+    assert next_after_id is None
+
+
+def test_get_goals_page_invalid_limit(app, session):
+    """Test error when the page size is not a positive integer."""
+    with pytest.raises(ValueError, match="limit must be a positive integer."):
+        Goals.get_goals_page(limit=0)
+
+
+def test_get_all_goals_sorted_by_target(session, two_goals):
+    """Test retrieving all goals sorted by target."""
+    goal_abs = Goals(target="abdominals", goal_value=5, goal_progress=0.0, completed=False, progress_notes='[]')
+    session.add(goal_abs)
+    session.commit()
+
+    goals = Goals.get_all_goals(sort_by_target=True)
+    assert [goal["target"] for goal in goals] == ["abdominals", "biceps", "pectorals"]
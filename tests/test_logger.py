@@ -0,0 +1,38 @@
+import logging
+
+import pytest
+
+from coach_peter.utils.logger import configure_logger
+
+
+def test_configure_logger_is_idempotent():
+    """Test configuring a logger twice does not attach a second handler."""
+    logger = logging.getLogger("tests.configure_logger")
+    logger.handlers.clear()
+
+    configure_logger(logger)
+    configure_logger(logger)
+
+    assert len(logger.handlers) == 1
+    logger.handlers.clear()
+
+
+@pytest.mark.parametrize("env_level, expected", [
+    (None, logging.INFO),
+    ("warning", logging.WARNING),
+    ("DEBUG", logging.DEBUG),
+    ("nonsense", logging.INFO),
+])
+def test_configure_logger_level_from_env(monkeypatch, env_level, expected):
+    """Test the logger level comes from LOG_LEVEL, defaulting to INFO."""
+    if env_level is None:
+        monkeypatch.delenv("LOG_LEVEL", raising=False)
+    else:
+        monkeypatch.setenv("LOG_LEVEL", env_level)
+    logger = logging.getLogger("tests.configure_logger_level")
+
+    configure_logger(logger)
+
+    assert logger.level == expected
+    assert logger.isEnabledFor(logging.DEBUG) == (expected == logging.DEBUG)
+    logger.handlers.clear()
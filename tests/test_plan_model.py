@@ -1,8 +1,10 @@
 import pytest
 
+from contextlib import nullcontext
+from types import SimpleNamespace
+
 from coach_peter.models.plan_model import PlanModel
 from coach_peter.models.goal_model import Goals
-from pytest_mock import MockerFixture
 
 
 @pytest.fixture()
@@ -11,16 +13,13 @@ def plan_model():
     return PlanModel()
 
 """Fixtures providing sample goals for the tests."""
+_BICEPS = dict(target="biceps", goal_value=40, goal_progress=35, completed=False, progress_notes='[]')
+_PECS = dict(target="pectorals", goal_value=200, goal_progress=225, completed=True, progress_notes='[]')
+
 @pytest.fixture
 def goal_biceps(session):
     """Fixture for a biceps goal."""
-    goal = Goals(
-       target = "biceps",
-       goal_value = 40,
-       goal_progress = 35,
-       completed = False,
-       progress_notes='[]'
-    )
+    goal = Goals(**_BICEPS)
     session.add(goal)
     session.commit()
     return goal
@@ -28,17 +27,39 @@ def goal_biceps(session):
 @pytest.fixture
 def goal_pecs(session):
     """Fixture for a pecs goal."""
-    goal = Goals(
-        target = "pectorals",
-        goal_value = 200,
-        goal_progress = 225,
-        completed = True,
-        progress_notes='[]'
-    )
+    goal = Goals(**_PECS)
     session.add(goal)
     session.commit()
     return goal
 
+@pytest.fixture
+def biceps_stub():
+    """Fixture for an in-memory stand-in for the biceps goal, for tests that never touch the database."""
+    return SimpleNamespace(id=1, **_BICEPS)
+
+@pytest.fixture
+def pecs_stub():
+    """Fixture for an in-memory stand-in for the pecs goal."""
+    return SimpleNamespace(id=2, **_PECS)
+
+@pytest.fixture
+def goal_lookup(monkeypatch):
+    """Fixture replacing the database goal lookup with a plain dict of goals by ID."""
+    goals = {}
+
+    def get_goal_by_id(goal_id):
+        if goal_id not in goals:
+            raise ValueError(f"Goal with ID {goal_id} not found")
+        return goals[goal_id]
+
+    monkeypatch.setattr(Goals, "get_goal_by_id", staticmethod(get_goal_by_id))
+    return goals
+
+@pytest.fixture
+def patched_cache(mocker):
+    """Fixture patching the plan's cache-or-database goal loader; tests set its return value or side effect."""
+    return mocker.patch.object(PlanModel, "_get_goal_from_cache_or_db")
+
 @pytest.fixture
 def sample_plan(goal_biceps, goal_pecs):
     """Fixture for a sample plan."""
@@ -49,31 +70,34 @@ def sample_plan(goal_biceps, goal_pecs):
 ##################################################
 
 
-def test_add_goal_to_plan(plan_model, goal_biceps, mocker):
+def test_add_goal_to_plan(plan_model, biceps_stub, goal_lookup):
     """Test adding a goal to the plan."""
-    mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", return_value=goal_biceps) # check return value
-    plan_model.add_goal_to_plan(1)
-    assert len(plan_model.plan) == 1
-    assert plan_model.plan[0] == 1
+    goal_lookup[1] = biceps_stub
+    assert plan_model.add_goal_to_plan(1) == biceps_stub
+    assert plan_model.plan == [1]
 
 
-def test_add_duplicate_goal_to_plan(plan_model, goal_biceps, mocker):
+def test_add_duplicate_goal_to_plan(plan_model, biceps_stub, goal_lookup):
     """Test error when adding a duplicate goal to the plan by ID."""
-    mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", side_effect=[goal_biceps] * 2) # check side effect
+    goal_lookup[1] = biceps_stub
     plan_model.add_goal_to_plan(1)
     with pytest.raises(ValueError, match="Goal with ID 1 already exists in the plan"):
         plan_model.add_goal_to_plan(1)
 
 
-def test_remove_goal_from_plan_by_goal_id(plan_model, mocker):
+def test_remove_goal_from_plan_by_goal_id(plan_model):
     """Test removing a goal from the plan by goal_id."""
-    mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", return_value=goal_biceps) # check return value
-
-    plan_model.plan = [1,2]
+    plan_model.plan.extend([1, 2])
 
     plan_model.remove_goal_by_goal_id(1)
-    assert len(plan_model.plan) == 1, f"Expected 1 goal, but got {len(plan_model.plan)}"
-    assert plan_model.plan[0] == 2, "Expected goal with id 2 to remain"
+    assert plan_model.plan == [2], "Expected only the goal with id 2 to remain"
+
+
+def test_add_goal_to_plan_looks_up_goal_once(plan_model, biceps_stub, patched_cache):
+    """Test adding a goal validates and loads it with a single lookup."""
+    patched_cache.return_value = biceps_stub
+    plan_model.add_goal_to_plan(biceps_stub.id)
+    patched_cache.assert_called_once_with(biceps_stub.id)
 
 
 def test_clear_plan(plan_model):
@@ -83,26 +107,125 @@ def test_clear_plan(plan_model):
     plan_model.clear_plan()
     assert len(plan_model.plan) == 0, "Plan should be empty after clearing"
 
+
+def test_plan_membership_tracks_list_changes(plan_model):
+    """Test membership checks stay correct however the plan list is modified."""
+    plan_model.plan = [1, 2]
+    plan_model.plan.append(3)
+    plan_model.plan.remove(1)
+    del plan_model.plan[0]
+
+    assert plan_model.plan == [3]
+    assert 3 in plan_model.plan
+    assert 1 not in plan_model.plan and 2 not in plan_model.plan
+
+
+def test_plan_membership_after_in_place_repeat(plan_model):
+    """Test emptying the plan with *= 0 also empties its membership set."""
+    plan = plan_model.plan
+    plan.extend([1, 2])
+    plan *= 0
+
+    assert plan == []
+    assert 1 not in plan
+
+
+def test_plan_version_bumps_on_change(plan_model, biceps_stub, goal_lookup):
+    """Test the plan version changes whenever the plan is modified."""
+    goal_lookup[1] = biceps_stub
+    assert plan_model.version == 0
+
+    plan_model.add_goal_to_plan(1)
+    assert plan_model.version == 1
+
+    plan_model.remove_goal_by_goal_id(1)
+    assert plan_model.version == 2
+
+    plan_model.clear_plan()
+    assert plan_model.version == 3
+
+def test_plan_model_has_no_instance_dict(plan_model):
+    """Test PlanModel uses slots, so stray attributes cannot be set."""
+    assert not hasattr(plan_model, "__dict__")
+    with pytest.raises(AttributeError):
+        plan_model.unexpected = True
+
+def test_goal_cache_is_bounded(monkeypatch, biceps_stub, mocker):
+    """Test the goal cache keeps at most GOAL_CACHE_SIZE goals."""
+    monkeypatch.setenv("GOAL_CACHE_SIZE", "1")
+    plan_model = PlanModel()
+    mock_get = mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", return_value=biceps_stub)
+
+    plan_model._get_goal_from_cache_or_db(1)
+    plan_model._get_goal_from_cache_or_db(2)
+    plan_model._get_goal_from_cache_or_db(1)
+
+    assert mock_get.call_count == 3
+    assert len(plan_model._goal_cache) == 1
+
 ##################################################
 # Goal Retrieval Test Cases
 ##################################################
 
-def test_get_all_goals(plan_model, sample_plan, mocker):
-    """Test successfully retrieving all goals from the plan."""
-    mocker.patch("coach_peter.models.plan_model.PlanModel._get_goal_from_cache_or_db", side_effect=sample_plan) # check side effect
-
+def test_get_all_goals(plan_model, biceps_stub, pecs_stub, mocker):
+    """Test successfully retrieving all goals from the plan, served from the cache."""
+    mock_get = mocker.patch("coach_peter.models.plan_model.Goals.get_goals_by_ids")
+    plan_model._goal_cache.set(1, biceps_stub)
+    plan_model._goal_cache.set(2, pecs_stub)
     plan_model.plan.extend([1, 2])
 
     all_goals = plan_model.get_all_goals()
 
-    assert len(all_goals) == 2
-    assert all_goals[0] == 1
-    assert all_goals[1] == 2
+    assert all_goals == [biceps_stub, pecs_stub]
+    mock_get.assert_not_called()
+
+
+def test_get_all_goals_loads_uncached_goals_in_one_query(plan_model, sample_plan, count_queries):
+    """Test goals missing from the cache are loaded with a single query."""
+    plan_model.plan.extend(sample_plan)
+
+    with count_queries() as statements:
+        all_goals = plan_model.get_all_goals()
+
+    assert [goal.id for goal in all_goals] == sample_plan
+    assert len(statements) == 1
+
+
+def test_get_all_goals_plan_larger_than_cache(monkeypatch, sample_plan, count_queries):
+    """Test a plan with more goals than the cache holds still takes one query per call."""
+    monkeypatch.setenv("GOAL_CACHE_SIZE", "1")
+    plan_model = PlanModel()
+    plan_model.plan.extend(sample_plan)
+
+    for _ in range(2):
+        with count_queries() as statements:
+            all_goals = plan_model.get_all_goals()
+        assert [goal.id for goal in all_goals] == sample_plan
+        assert len(statements) == 1
+
+
+def test_get_all_goals_missing_goal(plan_model, sample_plan):
+    """Test retrieving all goals raises an error if a goal in the plan no longer exists."""
+    plan_model.plan.extend(sample_plan + [999])
+    with pytest.raises(ValueError, match="Goal ID 999 not found in database"):
+        plan_model.get_all_goals()
 
 
-def test_get_goal_by_goal_id(plan_model, goal_biceps, mocker):
+def test_get_goal_ids(plan_model, patched_cache):
+    """Test retrieving the goal IDs in the plan without loading the goals."""
+    plan_model.plan.extend([1, 2])
+
+    goal_ids = plan_model.get_goal_ids()
+
+    assert goal_ids == [1, 2]
+    goal_ids.append(3)
+    assert plan_model.plan == [1, 2], "Returned list should be a copy"
+    patched_cache.assert_not_called()
+
+
+def test_get_goal_by_goal_id(plan_model, biceps_stub, goal_lookup):
     """Test successfully retrieving a goal from the plan by goal ID."""
-    mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", return_value=goal_biceps) # check return value
+    goal_lookup[1] = biceps_stub
     plan_model.plan.append(1)
 
     retrieved_goal = plan_model.get_goal_by_goal_id(1)
@@ -117,36 +240,49 @@ def test_get_plan_length(plan_model):
     assert plan_model.get_plan_length() == 2, "Expected plan length to be 2"
 
 
-def test_get_plan_progress(plan_model, sample_plan):
-    """Test getting the percent completed goals in a plan."""
+@pytest.mark.parametrize("completed_flags, expected", [
+    ([False, True], 0.5),
+    ([True, True], 1.0),
+    ([False, False], 0.0),
+    ([True, False, False], 0.333),
+])
+def test_get_plan_progress(plan_model, monkeypatch, completed_flags, expected):
+    """Test the plan progress is the share of completed goals, rounded to three places."""
+    monkeypatch.setattr(Goals, "count_completed", lambda goal_ids: (sum(completed_flags), len(goal_ids)))
+    plan_model.plan.extend(range(1, len(completed_flags) + 1))
+    assert plan_model.get_plan_progress() == expected
+
+def test_get_plan_progress_single_query(plan_model, sample_plan, count_queries):
+    """Test plan progress is counted with one query however many goals the plan has."""
     plan_model.plan.extend(sample_plan)
-    percentage = plan_model.get_plan_progress()
-    assert percentage == 0.500, "Expected plan progress to be 50% (0.500)"
+    with count_queries() as statements:
+        plan_model.get_plan_progress()
+    assert len(statements) == 1
+
+
+def test_get_plan_progress_missing_goal(plan_model, sample_plan):
+    """Test plan progress raises an error if a goal in the plan no longer exists."""
+    plan_model.plan.extend(sample_plan + [999])
+    with pytest.raises(ValueError, match="not found in the database"):
+        plan_model.get_plan_progress()
 
 ##################################################
 # Utility Function Test Cases
 ##################################################
 
 
-def test_check_if_empty_non_empty_plan(plan_model):
-    """Test check_if_empty does not raise error if plan is not empty."""
-    plan_model.plan.append(1)
-    try:
+@pytest.mark.parametrize("goal_ids, raises", [([1], False), ([], True)])
+def test_check_if_empty(plan_model, goal_ids, raises):
+    """Test check_if_empty raises an error only when the plan is empty."""
+    plan_model.plan.extend(goal_ids)
+    expectation = pytest.raises(ValueError, match="Plan is empty") if raises else nullcontext()
+    with expectation:
         plan_model.check_if_empty()
-    except ValueError:
-        pytest.fail("check_if_empty raised ValueError unexpectedly on non-empty plan")
 
 
-def test_check_if_empty_empty_plan(plan_model):
-    """Test check_if_empty raises error when plan is empty."""
-    plan_model.clear_plan()
-    with pytest.raises(ValueError, match="Plan is empty"):
-        plan_model.check_if_empty()
-
-
-def test_validate_goal_id(plan_model, mocker):
+def test_validate_goal_id(plan_model, biceps_stub, goal_lookup):
     """Test validate_goal_id does not raise error for valid goal ID."""
-    mocker.patch("coach_peter.models.plan_model.PlanModel._get_goal_from_cache_or_db", return_value=True) # check return value
+    goal_lookup[1] = biceps_stub
 
     plan_model.plan.append(1)
     try:
@@ -155,27 +291,25 @@ def test_validate_goal_id(plan_model, mocker):
         pytest.fail("validate_goal_id raised ValueError unexpectedly for valid goal ID")
 
 
-def test_validate_goal_id_no_check_in_plan(plan_model, mocker): # what is this testing?
+def test_validate_goal_id_no_check_in_plan(plan_model, biceps_stub, goal_lookup): # what is this testing?
     """Test validate_goal_id does not raise error for valid goal ID when the id isn't in the plan."""
-    mocker.patch("coach_peter.models.plan_model.PlanModel._get_goal_from_cache_or_db", return_value=True) # check return value
+    goal_lookup[1] = biceps_stub
     try:
         plan_model.validate_goal_id(1, check_in_plan=False)
     except ValueError:
         pytest.fail("validate_goal_id raised ValueError unexpectedly for valid goal ID")
 
 
-def test_validate_goal_id_invalid_id(plan_model): # same as above
+@pytest.mark.parametrize("goal_id", [-1, "invalid"])
+def test_validate_goal_id_invalid_id(plan_model, goal_id): # same as above
     """Test validate_goal_id raises error for invalid goal ID."""
-    with pytest.raises(ValueError, match="Invalid goal id: -1"):
-        plan_model.validate_goal_id(-1)
-
-    with pytest.raises(ValueError, match="Invalid goal id: invalid"):
-        plan_model.validate_goal_id("invalid")
+    with pytest.raises(ValueError, match=f"Invalid goal id: {goal_id}"):
+        plan_model.validate_goal_id(goal_id)
 
 
-def test_validate_goal_id_not_in_plan(plan_model, goal_pecs, mocker): # same as above
+def test_validate_goal_id_not_in_plan(plan_model, pecs_stub, goal_lookup): # same as above
     """Test validate_goal_id raises error for goal ID not in the plan."""
-    mocker.patch("coach_peter.models.plan_model.Goals.get_goal_by_id", return_value=goal_pecs) # check return value
+    goal_lookup[2] = pecs_stub
     plan_model.plan.append(1)
     with pytest.raises(ValueError, match="Goal with id 2 not found in plan"):
         plan_model.validate_goal_id(2)
\ No newline at end of file
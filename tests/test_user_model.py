@@ -53,6 +53,23 @@ def test_check_password_user_not_found(session):
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.check_password("nonexistentuser", "password")
 
+def test_authenticate_correct(session, sample_user):
+    """Test authenticating with the correct password returns the user."""
+    Users.create_user(**sample_user)
+    user = Users.authenticate(sample_user["username"], sample_user["password"])
+    assert user is not None, "User should be returned for the correct password."
+    assert user.username == sample_user["username"], "Returned user should match the username."
+
+def test_authenticate_incorrect(session, sample_user):
+    """Test authenticating with an incorrect password returns None."""
+    Users.create_user(**sample_user)
+    assert Users.authenticate(sample_user["username"], "wrongpassword") is None, "No user should be returned."
+
+def test_authenticate_user_not_found(session):
+    """Test authenticating a non-existent user."""
+    with pytest.raises(ValueError, match="User nonexistentuser not found"):
+        Users.authenticate("nonexistentuser", "password")
+
 ##########################################################
 # Update Password
 ##########################################################
@@ -112,3 +129,24 @@ def test_get_id_by_username_user_not_found(session):
     """
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.get_id_by_username("nonexistentuser")
+
+
+def test_get_id_returns_primary_key(session, sample_user):
+    """
+    Test that the Flask-Login id is the user's primary key as a string.
+    """
+    Users.create_user(**sample_user)
+    user = session.query(Users).filter_by(username=sample_user["username"]).first()
+    assert user.get_id() == str(user.id), "get_id should return the primary key as a string."
+
+
+def test_user_ids_not_reused(session, sample_user):
+    """
+    Test that a deleted user's id is not handed to the next user created.
+    """
+    Users.create_user(**sample_user)
+    old_id = Users.get_id_by_username(sample_user["username"])
+    Users.delete_user(sample_user["username"])
+
+    Users.create_user(**sample_user)
+    assert Users.get_id_by_username(sample_user["username"]) > old_id
@@ -0,0 +1,5 @@
+from app import create_app
+
+
+# WSGI entrypoint for gunicorn: gunicorn wsgi:app
+app = create_app()